@@ -0,0 +1,30 @@
+import gc
+import os
+import multiprocessing
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# Load the app (graph store, floor templates, NLP models) once in the master
+# and fork workers afterwards so they share those pages copy-on-write.
+preload_app = True
+
+workers = int(os.getenv("WEB_CONCURRENCY", min(multiprocessing.cpu_count() * 2 + 1, 8)))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+
+accesslog = "-"
+errorlog = "-"
+
+
+def when_ready(server):
+    # Move everything allocated during preload out of the collector's reach so
+    # the first gc pass in a worker doesn't touch (and copy) the shared pages.
+    gc.freeze()
+    server.log.info(f"Preloaded app shared with {workers} workers x {threads} threads")
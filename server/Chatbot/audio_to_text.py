@@ -1,26 +1,71 @@
 import io
-import spacy
-import speech_recognition as sr
 import re
 import sqlite3
-from rapidfuzz import process, fuzz
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-import nltk
+import threading
 import os
 from pathlib import Path
 from ..Utils.route_utilary import process_path_logic as process_data
 from ..Utils.loader import env_variables
 from werkzeug.datastructures import FileStorage
+from . import nlp_resources
+from .teacher_index import get_teacher_index
 
 
-nltk.download("stopwords", quiet=True)
-nltk.download("punkt", quiet=True)
-nltk.download("punkt_tab", quiet=True)
+_nlp = None
+_nlp_loaded = False
+_stop_words = None
+_tokenizer = None
+_nlp_lock = threading.Lock()
+
+
+def get_nlp():
+
+    global _nlp, _nlp_loaded
+    if not _nlp_loaded:
+        with _nlp_lock:
+            if not _nlp_loaded:
+                try:
+                    import spacy
+
+                    _nlp = spacy.load("en_core_web_sm")
+                except (ImportError, OSError) as e:
+                    print(f"spaCy model unavailable, skipping name extraction: {e}")
+                    _nlp = None
+                _nlp_loaded = True
+    return _nlp
+
+
+def get_stop_words():
+
+    global _stop_words
+    if _stop_words is None:
+        with _nlp_lock:
+            if _stop_words is None:
+                _stop_words = nlp_resources.load_stop_words()
+    return _stop_words
+
+
+def word_tokenize(text):
+
+    global _tokenizer
+    if _tokenizer is None:
+        with _nlp_lock:
+            if _tokenizer is None:
+                _tokenizer = nlp_resources.load_tokenizer()
+    return _tokenizer(text)
+
+
+def warm_up_nlp():
+
+    get_nlp()
+    get_stop_words()
+    word_tokenize("warm up")
 
 
 def audio_to_text(file_path: str) -> str:
 
+    import speech_recognition as sr
+
     if not Path(file_path).is_file():
         return "Error: The specified audio file was not found."
     recognizer = sr.Recognizer()
@@ -115,7 +160,7 @@ def main(
 
 def preprocess_query(query):
 
-    stop_words = set(stopwords.words("english"))
+    stop_words = get_stop_words()
 
     words = word_tokenize(query)
 
@@ -124,11 +169,11 @@ def preprocess_query(query):
     return " ".join(keywords)
 
 
-nlp = spacy.load("en_core_web_sm")
-
-
 def extract_names(text):
 
+    nlp = get_nlp()
+    if nlp is None:
+        return ""
     doc = nlp(text)
     names = [ent.text for ent in doc.ents if ent.label_ == "PERSON"]
     return "".join(names)
@@ -150,26 +195,16 @@ def get_teacher_details_with_preprocessing(
         )
         preprocessed_name = "".join(common_chars)
 
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        index = get_teacher_index(db_path)
+        matches = index.search(preprocessed_name, limit=1, score_cutoff=60)
 
-        query = "SELECT name, cabin_no, room_no, phone_number FROM teachers"
-        cursor.execute(query)
-        records = cursor.fetchall()
-
-        if not records:
+        if not index.entries[0]:
             return {"error": "No data found in the database."}
 
-        names = [row[0] for row in records]
-
-        match, score, index = process.extractOne(
-            preprocessed_name, names, scorer=fuzz.token_set_ratio
-        )
-
-        if score < 60:
+        if not matches:
             return {"error": "No close match found in the database."}
 
-        matched_row = records[index]
+        matched_row, _ = matches[0]
         return {
             "Matched_Name": matched_row[0].title(),
             "Cabin": matched_row[1],
@@ -178,10 +213,6 @@ def get_teacher_details_with_preprocessing(
         }
     except sqlite3.Error as e:
         return {"error": f"Database error: {e}"}
-    finally:
-
-        if conn:
-            conn.close()
 
 
 def open_audio_as_filestorage(file_path):
@@ -0,0 +1,97 @@
+import re
+import argparse
+from pathlib import Path
+
+
+NLTK_DATA_DIR = Path(__file__).resolve().parent / "nltk_data"
+
+NLTK_RESOURCES = {
+    "stopwords": "corpora/stopwords",
+    "punkt": "tokenizers/punkt",
+    "punkt_tab": "tokenizers/punkt_tab",
+}
+
+# NLTK's classic 179-word english stopword list, used when the corpus isn't
+# bundled. Newer corpus releases add a few words, so results can differ slightly.
+ENGLISH_STOP_WORDS = frozenset(
+    """
+    i me my myself we our ours ourselves you you're you've you'll you'd your
+    yours yourself yourselves he him his himself she she's her hers herself it
+    it's its itself they them their theirs themselves what which who whom this
+    that that'll these those am is are was were be been being have has had
+    having do does did doing a an the and but if or because as until while of
+    at by for with about against between into through during before after above
+    below to from up down in out on off over under again further then once here
+    there when where why how all any both each few more most other some such no
+    nor not only own same so than too very s t can will just don don't should
+    should've now d ll m o re ve y ain aren aren't couldn couldn't didn didn't
+    doesn doesn't hadn hadn't hasn hasn't haven haven't isn isn't ma mightn
+    mightn't mustn mustn't needn needn't shan shan't shouldn shouldn't wasn
+    wasn't weren weren't won won't wouldn wouldn't
+    """.split()
+)
+
+# Splits clitics the way word_tokenize does: "don't" -> "do n't", "John's" -> "John 's".
+TOKEN_PATTERN = re.compile(
+    r"\w+(?=n't\b)|n't\b|'(?:s|m|d|ll|re|ve)\b|\w+|[^\w\s]", re.IGNORECASE
+)
+
+
+def configure_nltk_path():
+
+    import nltk
+
+    if str(NLTK_DATA_DIR) not in nltk.data.path:
+        nltk.data.path.insert(0, str(NLTK_DATA_DIR))
+
+
+def has_resource(name):
+
+    try:
+        import nltk
+
+        configure_nltk_path()
+        nltk.data.find(NLTK_RESOURCES[name])
+        return True
+    except (ImportError, LookupError):
+        return False
+
+
+def load_stop_words():
+
+    if has_resource("stopwords"):
+        from nltk.corpus import stopwords
+
+        return frozenset(stopwords.words("english"))
+    return ENGLISH_STOP_WORDS
+
+
+def load_tokenizer():
+
+    if has_resource("punkt_tab"):
+        from nltk.tokenize import word_tokenize
+
+        return word_tokenize
+    return TOKEN_PATTERN.findall
+
+
+def download_resources(target=NLTK_DATA_DIR):
+
+    import nltk
+
+    target = Path(target)
+    target.mkdir(parents=True, exist_ok=True)
+
+    for name in NLTK_RESOURCES:
+        if not nltk.download(name, download_dir=str(target), quiet=True):
+            raise RuntimeError(f"Could not download NLTK resource '{name}'.")
+        print(f"Bundled NLTK resource '{name}' into {target}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Bundle NLTK resources for offline use"
+    )
+    parser.add_argument("--target", type=str, default=str(NLTK_DATA_DIR))
+    args = parser.parse_args()
+    download_resources(args.target)
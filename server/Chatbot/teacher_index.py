@@ -0,0 +1,53 @@
+import re
+from rapidfuzz import process, fuzz
+from ..Utils.loader import env_variables
+from ..Utils.refreshing_index import RefreshingIndex, get_index
+
+
+HONORIFICS = frozenset({"dr", "mr", "mrs", "ms", "miss", "prof", "sir", "madam"})
+NAME_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_name(name: str) -> str:
+
+    tokens = NAME_TOKEN_PATTERN.findall(name.lower())
+    return " ".join(token for token in tokens if token not in HONORIFICS)
+
+
+class TeacherIndex(RefreshingIndex):
+
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self.entries = ([], [])
+
+    def build(self, conn):
+
+        records = conn.execute(
+            "SELECT name, cabin_no, room_no, phone_number FROM teachers"
+        ).fetchall()
+
+        self.entries = (records, [normalize_name(row[0]) for row in records])
+        print(f"Teacher index loaded: {len(records)} names")
+
+    def search(self, query: str, limit: int = 1, score_cutoff: float = 60):
+
+        self.refresh()
+        records, names = self.entries
+        matches = process.extract(
+            normalize_name(query),
+            names,
+            scorer=fuzz.token_set_ratio,
+            limit=limit,
+            score_cutoff=score_cutoff,
+        )
+        return [(records[index], score) for _, score, index in matches]
+
+
+def get_teacher_index(db_path=env_variables["db_path"]):
+
+    return get_index(TeacherIndex, db_path)
+
+
+def warm_up(db_path=env_variables["db_path"]):
+
+    get_teacher_index(db_path).refresh()
@@ -0,0 +1,108 @@
+import sys
+import sqlite3
+import argparse
+from time import perf_counter
+from pathlib import Path
+from contextlib import closing
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from server.Utils import db_access, db_connections, loader, route_utilary
+
+
+MAP_QUERIES = [
+    (
+        """
+        SELECT x_coordinate, y_coordinate
+        FROM location_lookup
+        WHERE normalized_name LIKE ? AND floor = ? AND source = 'description'
+        """,
+        ("011%", 0),
+    ),
+    (
+        """
+        SELECT x_coordinate, y_coordinate
+        FROM location_lookup
+        WHERE normalized_name LIKE ? AND floor = ? AND source = 'description'
+        """,
+        ("Lift %", 0),
+    ),
+    (
+        """
+        SELECT x_coordinate, y_coordinate, floor
+        FROM location_lookup
+        WHERE normalized_name = TRIM(?)
+        ORDER BY source, anchor_point_id
+        LIMIT 1
+        """,
+        ("Library",),
+    ),
+    ("SELECT room_no FROM teachers WHERE TRIM(cabin_no) = ?;", ("A-502",)),
+]
+
+AUTH_QUERIES = [("SELECT password FROM users WHERE username = ?", ("admin",))]
+
+
+def fresh_request(map_db, auth_db):
+
+    for db_path, queries in ((map_db, MAP_QUERIES), (auth_db, AUTH_QUERIES)):
+        for query, params in queries:
+            with closing(sqlite3.connect(db_path)) as conn:
+                conn.execute(query, params).fetchall()
+
+
+def pooled_request(map_db, auth_db):
+
+    map_conn = db_connections.map_connection(map_db)
+    for query, params in MAP_QUERIES:
+        map_conn.execute(query, params).fetchall()
+    auth_conn = db_connections.auth_connection(auth_db)
+    for query, params in AUTH_QUERIES:
+        auth_conn.execute(query, params).fetchall()
+
+
+def db_access_request(map_db, auth_db):
+
+    db_access.get_coordinates(map_db, "011", 0)
+    db_access.get_coordinates(map_db, "Lift %", 0)
+    db_access.get_coordinates_thorough(map_db, "Library")
+    route_utilary.get_room_no_by_cabin("A502", map_db)
+    db_access.get_password_users(auth_db, "admin")
+
+
+def time_requests(fn, map_db, auth_db, requests):
+
+    fn(map_db, auth_db)
+    start = perf_counter()
+    for _ in range(requests):
+        fn(map_db, auth_db)
+    return (perf_counter() - start) * 1e6 / requests
+
+
+def main(map_db, auth_db, requests):
+
+    print(f"{'case':<32} {'us/request':>12}")
+    results = {}
+    for label, fn in (
+        ("fresh connection per query", fresh_request),
+        ("pooled connections", pooled_request),
+        ("db_access functions (pooled)", db_access_request),
+    ):
+        results[label] = time_requests(fn, map_db, auth_db, requests)
+        print(f"{label:<32} {results[label]:>12.1f}")
+
+    speedup = results["fresh connection per query"] / results["pooled connections"]
+    print(f"\nPooled connections are {speedup:.1f}x faster per request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure per-request SQLite connection overhead"
+    )
+    parser.add_argument("--db", type=str, default=loader.env_variables["db_path"])
+    parser.add_argument(
+        "--auth-db", type=str, default=loader.env_variables["user_db_path"]
+    )
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.db, args.auth_db, args.requests)
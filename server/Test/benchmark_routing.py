@@ -0,0 +1,112 @@
+import sys
+import random
+import argparse
+from time import perf_counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from server.Utils import graph_converter, graph_store, loader
+
+
+def time_calls(fn, pairs):
+
+    start = perf_counter()
+    results = [fn(a, b) for a, b in pairs]
+    return perf_counter() - start, results
+
+
+def compare(label, pairs, networkx_fn, csr_fn):
+
+    nx_time, nx_results = time_calls(networkx_fn, pairs)
+    csr_time, csr_results = time_calls(csr_fn, pairs)
+
+    mismatches = sum(
+        1
+        for (_, nx_weight), (_, csr_weight) in zip(nx_results, csr_results)
+        if abs(nx_weight - csr_weight) > 1e-6
+    )
+    print(
+        f"{label:<24} {len(pairs):>6} {nx_time * 1e3 / len(pairs):>12.3f} "
+        f"{csr_time * 1e3 / len(pairs):>12.3f} {nx_time / csr_time:>8.1f}x {mismatches:>10}"
+    )
+
+
+def main(db_path, pairs_per_floor, method, seed):
+
+    random.seed(seed)
+    store = graph_store.get_store(db_path)
+    graphs = store.graphs()
+
+    print(
+        f"{'case':<24} {'routes':>6} {'networkx ms':>12} {'csr ms':>12} {'speedup':>9} {'mismatches':>10}"
+    )
+
+    for floor, graph in sorted(graphs.items()):
+        nodes = list(graph.nodes)
+        if len(nodes) < 2:
+            continue
+        compact = store.compact_graph(floor)
+        pairs = [tuple(random.sample(nodes, 2)) for _ in range(pairs_per_floor)]
+        compare(
+            f"floor {floor}",
+            pairs,
+            lambda a, b: graph_converter.find_shortest_path(graph, a, b, method),
+            lambda a, b: compact.find_shortest_path(a, b, method=method),
+        )
+
+    multi_floor_graph = store.multi_floor_graph()
+    compact = store.compact_graph()
+    floors = sorted(graphs)
+    for floor_start, floor_end in [(floors[0], floors[-1]), (floors[1], floors[-2])]:
+        starts = list(graphs[floor_start].nodes)
+        ends = list(graphs[floor_end].nodes)
+        pairs = [
+            (random.choice(starts), random.choice(ends)) for _ in range(pairs_per_floor)
+        ]
+        weight = graph_converter.floor_change_weight(floor_start, floor_end)
+        compare(
+            f"floor {floor_start} -> {floor_end}",
+            pairs,
+            lambda a, b: graph_converter.find_shortest_path(
+                multi_floor_graph, a, b, method, weight=weight
+            ),
+            lambda a, b: compact.find_shortest_path(
+                a, b, (floor_start, floor_end), method=method
+            ),
+        )
+
+    nx_bytes = sum(
+        sys.getsizeof(data) for _, data in multi_floor_graph.nodes(data=True)
+    ) + sum(sys.getsizeof(data) for _, _, data in multi_floor_graph.edges(data=True))
+    csr_bytes = sum(
+        array.nbytes
+        for array in (
+            compact.node_ids,
+            compact.x,
+            compact.y,
+            compact.floor,
+            compact.indptr,
+            compact.indices,
+            compact.weights,
+            compact.kinds,
+        )
+    )
+    print(
+        f"\nAttribute storage: networkx dicts ~{nx_bytes / 1024:.1f} KiB, "
+        f"CSR arrays {csr_bytes / 1024:.1f} KiB"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare networkx and CSR routing engines"
+    )
+    parser.add_argument("--db", type=str, default=loader.env_variables["db_path"])
+    parser.add_argument("--pairs", type=int, default=200)
+    parser.add_argument(
+        "--method", type=str, default="dijkstra", choices=["dijkstra", "astar"]
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    main(args.db, args.pairs, args.method, args.seed)
@@ -0,0 +1,212 @@
+import io
+import os
+import sys
+import random
+import sqlite3
+import tempfile
+import subprocess
+from pathlib import Path
+from contextlib import redirect_stdout
+from lxml import etree as ET
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from server.Utils import extractor, loader, svg_manipulator
+from server.Utils.graph_repair import (
+    repair_floor_maps,
+    repair_graph,
+    snap_points,
+    write_path_layer,
+)
+
+NS = {"svg": "http://www.w3.org/2000/svg"}
+
+TEST_SVG = """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 30 30">
+  <g id="Path" class="cls-1">
+    <polyline class="cls-3" points="0 0 10 0 20 0"/>
+    <line class="cls-3" x1="10.5" y1="0.4" x2="10.5" y2="10"/>
+    <line class="cls-3" x1="15" y1="0.5" x2="15" y2="20"/>
+  </g>
+  <text transform="translate(15 25)"><tspan>101</tspan></text>
+</svg>
+"""
+
+
+def connections_for(segments):
+
+    return extractor.add_distances_to_list(segments)
+
+
+def check_rejects_bad_tolerance():
+
+    points = [(0.0, 0.0), (10.0, 0.0)]
+    connections = connections_for([((0.0, 0.0), (10.0, 0.0))])
+    for tolerance in (0, -1.0, float("nan")):
+        try:
+            repair_graph(points, connections, tolerance)
+        except ValueError:
+            continue
+        return f"repair_graph accepted tolerance {tolerance}"
+
+    process = subprocess.run(
+        [sys.executable, "-m", "server.Utils.graph_repair", "--tolerance", "0"],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).resolve().parents[2],
+    )
+    if process.returncode != 2 or "must be positive" not in process.stderr:
+        return f"CLI accepted --tolerance 0: {process.stderr.strip()}"
+    return None
+
+
+def check_no_chained_snapping():
+
+    # Three dangling ends 0.8 apart: a union-find would merge all of them
+    # although the outer two are 1.6 apart.
+    ends = [(0.0, 0.0), (0.8, 0.0), (1.6, 0.0)]
+    segments = [(end, (end[0] * 10, 50.0)) for end in ends]
+    # A path whose interior vertex lies next to another interior vertex.
+    segments += [
+        ((20.0, 0.0), (20.0, 10.0)),
+        ((20.0, 10.0), (20.0, 20.0)),
+        ((20.5, -10.0), (20.5, 10.0)),
+        ((20.5, 10.0), (20.5, 30.0)),
+    ]
+    points = sorted({point for segment in segments for point in segment})
+
+    snapped = snap_points(points, segments, 1.0)
+    for point, target in snapped.items():
+        if (point[0] - target[0]) ** 2 + (point[1] - target[1]) ** 2 > 1.0:
+            return f"{point} snapped to {target}, farther than the tolerance"
+    if snapped[(0.0, 0.0)] == snapped[(1.6, 0.0)]:
+        return "points 1.6 apart were merged by a chain of snaps"
+    for interior in ((20.0, 10.0), (20.5, 10.0)):
+        if snapped[interior] != interior:
+            return f"interior vertex {interior} was snapped"
+
+    _, connections, report = repair_graph(points, connections_for(segments), 1.0)
+    if report["snapped_points"] != 1:
+        return f"expected 1 snapped point, got {report['snapped_points']}"
+    return None
+
+
+def check_path_layer_matches_repair():
+
+    work = tempfile.mkdtemp(prefix="graph_repair_")
+    svg_file = os.path.join(work, "floor 1 copy path.svg")
+    with open(svg_file, "w") as f:
+        f.write(TEST_SVG)
+
+    with redirect_stdout(io.StringIO()):
+        points, connections = extractor.process_svg_file(svg_file)
+        _, repaired, report = repair_graph(points, connections, 1.0)
+        output_file = write_path_layer(
+            svg_file, repaired, os.path.join(work, "repaired.svg")
+        )
+        _, drawn = extractor.process_svg_file(output_file)
+
+    if not report["snapped_points"] or not report["split_segments"]:
+        return f"test map was not snapped and split: {report}"
+    if sorted(edge for edge, _ in drawn) != sorted(edge for edge, _ in repaired):
+        return "the written Path layer does not draw the repaired segments"
+    if ET.parse(output_file).find(".//svg:text", NS) is None:
+        return "non-path content was dropped from the floor map"
+    return None
+
+
+def is_covered(lines, p, q, t):
+
+    x, y = p[0] + (q[0] - p[0]) * t, p[1] + (q[1] - p[1]) * t
+    for (x1, y1), (x2, y2) in lines:
+        dx, dy = x2 - x1, y2 - y1
+        length = dx * dx + dy * dy
+        if not length:
+            continue
+        u = ((x - x1) * dx + (y - y1) * dy) / length
+        if (
+            -1e-6 <= u <= 1 + 1e-6
+            and (x1 + u * dx - x) ** 2 + (y1 + u * dy - y) ** 2 < 1e-4
+        ):
+            return True
+    return False
+
+
+def highlighted_gaps(svg_bytes, path):
+
+    lines = [
+        (
+            (float(line.get("x1")), float(line.get("y1"))),
+            (float(line.get("x2")), float(line.get("y2"))),
+        )
+        for line in ET.fromstring(svg_bytes).xpath(
+            "//svg:g[@id='Path']/svg:line", namespaces=NS
+        )
+        if line.get("visibility") == "visible"
+    ]
+    return [
+        (p, q)
+        for p, q in zip(path, path[1:])
+        if not all(is_covered(lines, p, q, t) for t in (0.25, 0.5, 0.75))
+    ]
+
+
+def check_repaired_routes_render(routes_per_floor=6):
+
+    floor_maps = loader.env_variables["floor_map"]
+    work = tempfile.mkdtemp(prefix="graph_repair_")
+    db_path = os.path.join(work, "repaired.db")
+    output_dir = os.path.join(work, "Floor_Maps")
+    with redirect_stdout(io.StringIO()):
+        repair_floor_maps(floor_maps, 1.0, db_path, output_dir)
+
+    loader.env_variables["db_path"] = db_path
+    loader.env_variables["floor_map"] = output_dir
+
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute(
+            """
+            SELECT apc.floor, TRIM(apd.description)
+            FROM anchor_point_description apd
+            JOIN anchor_point_coordinates apc ON apc.id = apd.anchor_point_id
+            WHERE apd.description GLOB '[0-9][0-9][0-9]'
+            """
+        ).fetchall()
+    rooms = {}
+    for floor, room in rows:
+        rooms.setdefault(floor, []).append(room)
+
+    random.seed(0)
+    rendered = 0
+    for floor, names in sorted(rooms.items()):
+        for _ in range(routes_per_floor):
+            start, end = random.sample(names, 2)
+            with redirect_stdout(io.StringIO()):
+                result = svg_manipulator.main(start, end, None, write_files=False)
+            if result["error"] or result["complexity"] != "simple":
+                continue
+            route_floor, path = result["path"]
+            gaps = highlighted_gaps(result["svgs"][route_floor], path)
+            if gaps:
+                return f"{start} -> {end} on floor {route_floor} has gaps at {gaps}"
+            rendered += 1
+
+    if not rendered:
+        return "no simple routes could be rendered on the repaired database"
+    return None
+
+
+if __name__ == "__main__":
+    failed = False
+    for check in (
+        check_rejects_bad_tolerance,
+        check_no_chained_snapping,
+        check_path_layer_matches_repair,
+        check_repaired_routes_render,
+    ):
+        error = check()
+        if error:
+            print(f"FAIL {check.__name__}: {error}")
+            failed = True
+        else:
+            print(f"PASS {check.__name__}")
+    sys.exit(1 if failed else 0)
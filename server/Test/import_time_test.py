@@ -0,0 +1,71 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+
+HEAVY_MODULES = ["spacy", "nltk", "speech_recognition", "thinc"]
+
+PROBE = f"""
+import sys, json, time
+start = time.perf_counter()
+import server.app
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure_import(runs):
+
+    repo_root = Path(__file__).resolve().parents[2]
+    env = dict(os.environ, NLP_EAGER_LOAD="0")
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(repo_root), env.get("PYTHONPATH")])
+    )
+
+    results = []
+    for _ in range(runs):
+        process = subprocess.run(
+            [sys.executable, "-c", PROBE],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=repo_root,
+            env=env,
+        )
+        results.append(json.loads(process.stdout.strip().splitlines()[-1]))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Check that importing server.app stays within a time budget"
+    )
+    parser.add_argument("--budget", type=float, default=2.0, help="Seconds")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    try:
+        results = measure_import(args.runs)
+    except subprocess.CalledProcessError as e:
+        print(f"Error: importing server.app failed\n{e.stderr}")
+        sys.exit(1)
+
+    best = min(result["seconds"] for result in results)
+    loaded = sorted({m for result in results for m in result["loaded"]})
+    print(f"Import time of server.app (best of {args.runs}): {best:.3f}s")
+
+    failed = False
+    if best > args.budget:
+        print(f"FAIL: exceeds the {args.budget:.1f}s budget")
+        failed = True
+    if loaded:
+        print(f"FAIL: heavy NLP modules imported eagerly: {', '.join(loaded)}")
+        failed = True
+    if not failed:
+        print("PASS")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,54 @@
+import os
+import sys
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from server.Utils import route_utilary
+from server.Utils.route_artifacts import artifact_store
+
+
+def check_cached_route_survives_pruning(start, end):
+
+    artifact_store.directory = tempfile.mkdtemp(prefix="route_artifacts_")
+    artifact_store.max_items = 8
+
+    result = route_utilary.get_route(start, end, None)
+    if result["error"] or result["complexity"] != "complex":
+        return f"{start} -> {end} is not a complex route: {result['error']}"
+
+    artifacts = result["artifacts"]
+    for artifact_id in artifacts.values():
+        os.utime(artifact_store._path(artifact_id), (0, 0))
+    for i in range(artifact_store.max_items + 1):
+        artifact_store.put(f"<svg id='filler-{i}'/>".encode())
+    if any(os.path.exists(artifact_store._path(i)) for i in artifacts.values()):
+        return "filling the store did not prune the route's artifacts"
+
+    # Another worker: the route is cached but its memory LRU is empty.
+    artifact_store._memory.clear()
+    cached = route_utilary.get_route(start, end, None)
+    if cached["artifacts"] != artifacts:
+        return "the cached route was rendered again instead of served from cache"
+    for floor, artifact_id in cached["artifacts"].items():
+        response = route_utilary.load_shortest_path_svg_logic(floor, artifact_id)
+        if isinstance(response, tuple) and response[1] == 404:
+            return f"floor {floor} artifact {artifact_id} returned 404"
+    return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Check that cached complex routes keep their SVG artifacts"
+    )
+    parser.add_argument("--start", type=str, default="011")
+    parser.add_argument("--end", type=str, default="511")
+    args = parser.parse_args()
+
+    error = check_cached_route_survives_pruning(args.start, args.end)
+    if error:
+        print(f"FAIL check_cached_route_survives_pruning: {error}")
+        sys.exit(1)
+    print("PASS check_cached_route_survives_pruning")
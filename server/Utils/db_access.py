@@ -1,20 +1,55 @@
 import sqlite3
 from typing import List, Dict, Any
 from .loader import env_variables
+from .db_connections import map_connection, map_write_connection, auth_connection
+
+
+LEGACY_COORDINATES_QUERY = """
+    SELECT apc.x_coordinate, apc.y_coordinate
+    FROM anchor_point_coordinates apc
+    JOIN anchor_point_description apd ON apc.id = apd.anchor_point_id
+    WHERE TRIM(apd.description) LIKE TRIM(?||'%') AND apc.floor = ?
+"""
+
+LEGACY_THOROUGH_QUERY = """
+    SELECT apc.x_coordinate, apc.y_coordinate, apc.floor
+    FROM anchor_point_coordinates apc
+    JOIN anchor_point_description apd ON apc.id = apd.anchor_point_id
+    WHERE apd.description LIKE '%' || ? || '%'
+       OR apd.extra_info LIKE '%' || ? || '%';
+"""
+
+FTS_TRIGRAM_LENGTH = 3
+
+_legacy_warned = set()
+
+
+def warn_legacy_lookup(db_path, error):
+
+    if db_path not in _legacy_warned:
+        _legacy_warned .add(db_path)
+        print(f"Warning: {error}. {db_path} has not been migrated, so location "
+              "lookups fall back to the slow LIKE queries. Run "
+              "'python -m server.Utils.db_migrations' to add the lookup tables.")
 
 
 def get_coordinates(db_path, description_condition, floor_condition):
 
+    pattern = f"{description_condition}%".strip(" ")
     try:
-        with sqlite3 .connect(db_path)as conn:
+        with map_connection(db_path)as conn:
             cursor = conn .cursor()
             query = """
-                SELECT apc.x_coordinate, apc.y_coordinate
-                FROM anchor_point_coordinates apc
-                JOIN anchor_point_description apd ON apc.id = apd.anchor_point_id
-                WHERE TRIM(apd.description) LIKE TRIM(?||'%') AND apc.floor = ?
+                SELECT x_coordinate, y_coordinate
+                FROM location_lookup
+                WHERE normalized_name LIKE ? AND floor = ? AND source = 'description'
             """
-            cursor .execute(query, (description_condition, floor_condition))
+            try:
+                cursor .execute(query, (pattern, floor_condition))
+            except sqlite3 .OperationalError as e:
+                warn_legacy_lookup(db_path, e)
+                cursor .execute(LEGACY_COORDINATES_QUERY,
+                                (description_condition, floor_condition))
             return cursor .fetchall()
     except sqlite3 .Error as e:
         print(f"Database error: {e}")
@@ -23,21 +58,52 @@ def get_coordinates(db_path, description_condition, floor_condition):
     return None
 
 
+def search_locations(cursor, description_condition):
+
+    cursor .execute("""
+        SELECT x_coordinate, y_coordinate, floor
+        FROM location_lookup
+        WHERE normalized_name = TRIM(?)
+        ORDER BY source, anchor_point_id
+        LIMIT 1
+    """, (description_condition,))
+    result = cursor .fetchone()
+    if result:
+        return result
+
+    if len(description_condition) >= FTS_TRIGRAM_LENGTH:
+        phrase = '"' + description_condition .replace('"', '""') + '"'
+        cursor .execute("""
+            SELECT x_coordinate, y_coordinate, floor
+            FROM location_fts
+            WHERE location_fts MATCH ?
+            ORDER BY rowid
+            LIMIT 1
+        """, (phrase,))
+    else:
+        cursor .execute("""
+            SELECT x_coordinate, y_coordinate, floor
+            FROM location_fts
+            WHERE description LIKE '%' || ? || '%'
+               OR extra_info LIKE '%' || ? || '%'
+            ORDER BY rowid
+            LIMIT 1
+        """, (description_condition, description_condition))
+    return cursor .fetchone()
+
+
 def get_coordinates_thorough(db_path, description_condition):
 
     try:
-        with sqlite3 .connect(db_path)as conn:
+        with map_connection(db_path)as conn:
             cursor = conn .cursor()
-            query = """
-                SELECT apc.x_coordinate, apc.y_coordinate, apc.floor
-                FROM anchor_point_coordinates apc
-                JOIN anchor_point_description apd ON apc.id = apd.anchor_point_id
-                WHERE apd.description LIKE '%' || ? || '%' 
-                   OR apd.extra_info LIKE '%' || ? || '%';
-            """
-            cursor .execute(
-                query, (description_condition, description_condition))
-            return cursor .fetchone()
+            try:
+                return search_locations(cursor, description_condition)
+            except sqlite3 .OperationalError as e:
+                warn_legacy_lookup(db_path, e)
+                cursor .execute(LEGACY_THOROUGH_QUERY,
+                                (description_condition, description_condition))
+                return cursor .fetchone()
     except sqlite3 .Error as e:
         print(f"Database error: {e}")
     except Exception as e:
@@ -48,7 +114,7 @@ def get_coordinates_thorough(db_path, description_condition):
 def get_description(db_path, coordinates, floor_condition):
 
     try:
-        with sqlite3 .connect(db_path)as conn:
+        with map_connection(db_path)as conn:
             cursor = conn .cursor()
             query = """
                 SELECT apd.description
@@ -81,7 +147,7 @@ def get_teacher_data(db_path: str, name: str = None, cabin_no: str = None, room_
         params .append(room_no)
 
     try:
-        with sqlite3 .connect(db_path)as conn:
+        with map_connection(db_path)as conn:
             cursor = conn .cursor()
             cursor .execute(query, params)
             result = cursor .fetchall()
@@ -102,7 +168,7 @@ def get_teacher_data(db_path: str, name: str = None, cabin_no: str = None, room_
 def add_teacher_to_db(db_path: str, data: Dict[str, Any]):
 
     try:
-        with sqlite3 .connect(db_path)as conn:
+        with map_write_connection(db_path)as conn:
             cursor = conn .cursor()
             cursor .execute("""
                 INSERT INTO teachers (name, cabin_no, room_no, phone_number)
@@ -116,7 +182,7 @@ def add_teacher_to_db(db_path: str, data: Dict[str, Any]):
 def get_password_users(db_path, username):
 
     try:
-        with sqlite3 .connect(db_path)as conn:
+        with auth_connection(db_path)as conn:
             cursor = conn .cursor()
 
             query = "SELECT password FROM users WHERE username = ?"
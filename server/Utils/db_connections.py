@@ -0,0 +1,95 @@
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from . import loader
+
+
+_local = threading.local()
+
+
+def _tuned_pragmas():
+
+    return [
+        f"PRAGMA cache_size = {loader.env_variables['sqlite_cache_size']}",
+        f"PRAGMA mmap_size = {loader.env_variables['sqlite_mmap_size']}",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA busy_timeout = 5000",
+    ]
+
+
+def _open(path, mode):
+
+    if mode == "ro":
+        uri = f"{Path(path).resolve().as_uri()}?mode=ro"
+        if loader.env_variables["map_db_immutable"]:
+            uri += "&immutable=1"
+        conn = sqlite3.connect(uri, uri=True)
+        pragmas = _tuned_pragmas() + ["PRAGMA query_only = ON"]
+    elif mode == "wal":
+        conn = sqlite3.connect(path)
+        pragmas = _tuned_pragmas() + [
+            "PRAGMA journal_mode = WAL",
+            "PRAGMA synchronous = NORMAL",
+            "PRAGMA foreign_keys = ON",
+        ]
+    else:
+        conn = sqlite3.connect(path)
+        pragmas = _tuned_pragmas()
+
+    for pragma in pragmas:
+        conn.execute(pragma)
+    return conn
+
+
+def _file_id(path):
+
+    try:
+        stat = os.stat(path)
+        return stat.st_dev, stat.st_ino
+    except OSError:
+        return None
+
+
+def get_connection(db_path, mode="rw"):
+
+    pid = os.getpid()
+    if getattr(_local, "pid", None) != pid:
+        _local.pid = pid
+        _local.connections = {}
+
+    path = os.path.abspath(db_path)
+    key = (path, mode)
+    file_id = _file_id(path)
+    entry = _local.connections.get(key)
+
+    if entry is not None and entry[1] != file_id:
+        entry[0].close()
+        entry = None
+
+    if entry is None:
+        entry = (_open(path, mode), file_id)
+        _local.connections[key] = entry
+    return entry[0]
+
+
+def map_connection(db_path=None):
+
+    return get_connection(db_path or loader.env_variables["db_path"], "ro")
+
+
+def map_write_connection(db_path=None):
+
+    return get_connection(db_path or loader.env_variables["db_path"], "rw")
+
+
+def auth_connection(db_path=None):
+
+    return get_connection(db_path or loader.env_variables["user_db_path"], "wal")
+
+
+def close_all():
+
+    for conn, _ in getattr(_local, "connections", {}).values():
+        conn.close()
+    _local.connections = {}
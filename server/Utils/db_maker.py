@@ -1,9 +1,12 @@
 import sqlite3
 import re
 import os
+import argparse
+import numpy as np
 from . import extractor
 from typing import List, Tuple
 from . import loader
+from .db_connections import auth_connection
 from .db_shortest_path_maker import is_valid_digit as dbs
 from . import svg_manipulator as svg_man
 from datetime import datetime
@@ -66,37 +69,128 @@ def create_teachers_database(cursor):
     print("Teachers database and table created successfully.")
 
 
-def insert_coordinates(coordinates, cursor, floor):
+def create_location_index(cursor):
+
+    cursor.execute(
+        """
+CREATE TABLE IF NOT EXISTS location_lookup (
+    id INTEGER PRIMARY KEY,
+    anchor_point_id INTEGER NOT NULL,
+    normalized_name TEXT NOT NULL COLLATE NOCASE,
+    source TEXT NOT NULL,
+    floor INTEGER,
+    x_coordinate REAL NOT NULL,
+    y_coordinate REAL NOT NULL
+);"""
+    )
+
+    cursor.execute(
+        """
+CREATE INDEX IF NOT EXISTS idx_location_lookup_name_floor
+ON location_lookup (normalized_name, floor, source, x_coordinate, y_coordinate);"""
+    )
+
+    cursor.execute(
+        """
+CREATE VIRTUAL TABLE IF NOT EXISTS location_fts USING fts5(
+    description,
+    extra_info,
+    floor UNINDEXED,
+    x_coordinate UNINDEXED,
+    y_coordinate UNINDEXED,
+    tokenize = 'trigram'
+);"""
+    )
+
+
+def build_location_index(cursor):
+
+    create_location_index(cursor)
+    cursor.execute("DELETE FROM location_lookup")
+    cursor.execute("DELETE FROM location_fts")
 
-    for x, y in coordinates:
+    for source in ("description", "extra_info"):
         cursor.execute(
+            f"""
+            INSERT INTO location_lookup
+                (anchor_point_id, normalized_name, source, floor, x_coordinate, y_coordinate)
+            SELECT apd.anchor_point_id, TRIM(apd.{source}), '{source}',
+                   apc.floor, apc.x_coordinate, apc.y_coordinate
+            FROM anchor_point_description apd
+            JOIN anchor_point_coordinates apc ON apc.id = apd.anchor_point_id
+            WHERE TRIM(apd.{source}) != ''
+            ORDER BY apd.id
             """
-            INSERT INTO anchor_point_coordinates (x_coordinate, y_coordinate, floor)
-            VALUES (?, ?, ?)
-        """,
-            (x, y, floor),
         )
 
+    cursor.execute(
+        """
+        INSERT INTO location_fts
+            (rowid, description, extra_info, floor, x_coordinate, y_coordinate)
+        SELECT apd.id, apd.description, apd.extra_info,
+               apc.floor, apc.x_coordinate, apc.y_coordinate
+        FROM anchor_point_description apd
+        JOIN anchor_point_coordinates apc ON apc.id = apd.anchor_point_id
+        """
+    )
+    cursor.execute("ANALYZE location_lookup")
+
+    print("Location lookup index rebuilt successfully.")
+
+
+def build_location_index_for_db(db_path):
+
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.cursor()
+        create_database(cursor)
+        build_location_index(cursor)
+
+
+def insert_coordinates(coordinates, cursor, floor):
+
+    cursor.executemany(
+        """
+        INSERT INTO anchor_point_coordinates (x_coordinate, y_coordinate, floor)
+        VALUES (?, ?, ?)
+    """,
+        [(x, y, floor) for x, y in coordinates],
+    )
+
     print(
         f"{len(coordinates)} coordinates inserted successfully into the anchor_point_coordinates table."
     )
 
 
+def get_coordinate_ids(cursor, floor=None):
+
+    if floor is None:
+        cursor.execute(
+            "SELECT id, x_coordinate, y_coordinate FROM anchor_point_coordinates "
+            "ORDER BY id"
+        )
+        return {(x, y): point_id for point_id, x, y in cursor.fetchall()}
+
+    cursor.execute(
+        """
+        SELECT id, x_coordinate, y_coordinate FROM anchor_point_coordinates
+        WHERE floor = ?
+        ORDER BY id DESC
+        """,
+        (floor,),
+    )
+    return {(x, y): point_id for point_id, x, y in cursor.fetchall()}
+
+
 def insert_descriptions_from_connections(
     connections: List[Tuple[Tuple[Tuple[float, float], Tuple[float, float]], float]],
     cursor,
     floor: int,
 ):
 
-    all_coordinates = []
-    for connection in connections:
-        (point_a, point_b), _ = connection
-        all_coordinates.append(point_a)
-        all_coordinates.append(point_b)
-
     coordinate_count = {}
-    for coord in all_coordinates:
-        coordinate_count[coord] = coordinate_count.get(coord, 0) + 1
+    for (point_a, point_b), _ in connections:
+        coordinate_count[point_a] = coordinate_count.get(point_a, 0) + 1
+        coordinate_count[point_b] = coordinate_count.get(point_b, 0) + 1
 
     unique_coordinates = [
         coord for coord, count in coordinate_count.items() if count == 1
@@ -106,61 +200,43 @@ def insert_descriptions_from_connections(
         print("No unique coordinates found.")
         return
 
-    unique_point_ids = []
-    for x, y in unique_coordinates:
-
-        cursor.execute(
-            """
-            SELECT id FROM anchor_point_coordinates 
-            WHERE x_coordinate = ? AND y_coordinate = ? AND floor = ?
-            """,
-            (x, y, floor),
-        )
-        result = cursor.fetchone()
-
-        if result:
-            point_id = result[0]
-        else:
+    coordinate_to_id = get_coordinate_ids(cursor, floor)
 
-            cursor.execute(
-                """
-                INSERT INTO anchor_point_coordinates (x_coordinate, y_coordinate, floor) 
-                VALUES (?, ?, ?)
-                """,
-                (x, y, floor),
-            )
-            point_id = cursor.lastrowid
-
-        unique_point_ids.append((point_id, x, y))
+    missing_coordinates = [
+        coord
+        for coord in dict.fromkeys(unique_coordinates)
+        if coord not in coordinate_to_id
+    ]
+    if missing_coordinates:
+        insert_coordinates(missing_coordinates, cursor, floor)
+        coordinate_to_id = get_coordinate_ids(cursor, floor)
 
-    for anchor_id, x, y in unique_point_ids:
-        cursor.execute(
-            """
-            INSERT INTO anchor_point_description (anchor_point_id, name, description, extra_info)
-            VALUES (?, ?, ?, ?)
-            """,
+    cursor.executemany(
+        """
+        INSERT INTO anchor_point_description (anchor_point_id, name, description, extra_info)
+        VALUES (?, ?, ?, ?)
+        """,
+        [
             (
-                anchor_id,
+                coordinate_to_id[(x, y)],
                 f"Anchor at ({x}, {y})",
                 "Unique anchor point",
                 "Auto-generated description",
-            ),
-        )
+            )
+            for x, y in unique_coordinates
+        ],
+    )
 
     print(
-        f"{len(unique_point_ids)} unique anchor points inserted into anchor_point_description."
+        f"{len(unique_coordinates)} unique anchor points inserted into anchor_point_description."
     )
 
 
 def insert_connections(connections, cursor):
 
-    cursor.execute(
-        "SELECT id, x_coordinate, y_coordinate FROM anchor_point_coordinates"
-    )
-    anchor_points = cursor.fetchall()
-
-    coordinate_to_id = {(row[1], row[2]): row[0] for row in anchor_points}
+    coordinate_to_id = get_coordinate_ids(cursor)
 
+    rows = []
     skipped_connections = []
 
     for (start_point, end_point), distance in connections:
@@ -173,16 +249,18 @@ def insert_connections(connections, cursor):
         point_b_id = coordinate_to_id.get(end_point)
 
         if point_a_id and point_b_id:
-            cursor.execute(
-                """
-                INSERT INTO connections (point_a_id, point_b_id, distance)
-                VALUES (?, ?, ?)
-            """,
-                (point_a_id, point_b_id, distance),
-            )
+            rows.append((point_a_id, point_b_id, distance))
         else:
             skipped_connections.append((start_point, end_point, distance))
 
+    cursor.executemany(
+        """
+        INSERT INTO connections (point_a_id, point_b_id, distance)
+        VALUES (?, ?, ?)
+    """,
+        rows,
+    )
+
     if skipped_connections:
         print("Skipped connections:")
         for connection in skipped_connections:
@@ -200,7 +278,7 @@ def process_svg_data(svg_file, coordinates, connections, db_path):
 
         create_database(cursor)
 
-        floor_number = int(re.findall(r"\d", svg_file)[0])
+        floor_number = int(re.findall(r"\d", os.path.basename(svg_file))[0])
 
         insert_coordinates(coordinates, cursor, floor_number)
         insert_connections(connections, cursor)
@@ -208,6 +286,7 @@ def process_svg_data(svg_file, coordinates, connections, db_path):
 
         text = svg_man.parse_svg_text(svg_file)
         find_closest_text_and_update_db(text, cursor, floor_number)
+        build_location_index(cursor)
 
 
 def create_user_db(db_path):
@@ -240,7 +319,7 @@ def create_user_db(db_path):
 
 def add_user(username, password, db_path):
     try:
-        with sqlite3.connect(db_path) as conn:
+        with auth_connection(db_path) as conn:
             cursor = conn.cursor()
 
             cursor.execute(
@@ -259,7 +338,7 @@ def add_user(username, password, db_path):
 
 def add_login_timestamp(username, db_path):
     try:
-        with sqlite3.connect(db_path) as conn:
+        with auth_connection(db_path) as conn:
             cursor = conn.cursor()
 
             cursor.execute("SELECT id FROM users WHERE username = ?", (username,))
@@ -285,14 +364,14 @@ def add_login_timestamp(username, db_path):
 
 
 def get_all_users(db_path):
-    with sqlite3.connect(db_path) as conn:
+    with auth_connection(db_path) as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM users;")
         return cursor.fetchall()
 
 
 def get_login_timestamps(username, db_path):
-    with sqlite3.connect(db_path) as conn:
+    with auth_connection(db_path) as conn:
         cursor = conn.cursor()
 
         cursor.execute("SELECT id FROM users WHERE username = ?", (username,))
@@ -310,7 +389,7 @@ def get_login_timestamps(username, db_path):
 
 
 def delete_user(username, db_path):
-    with sqlite3.connect(db_path) as conn:
+    with auth_connection(db_path) as conn:
         cursor = conn.cursor()
         cursor.execute("DELETE FROM users WHERE username = ?", (username,))
         if cursor.rowcount > 0:
@@ -332,9 +411,8 @@ def find_closest_text_and_update_db(svg_data, cursor, floor):
     )
     anchor_points = cursor.fetchall()
 
-    def calculate_distance(x1, y1, x2, y2):
-
-        return ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
+    if not anchor_points or not svg_data:
+        return
 
     def transform_room_section(input_str):
 
@@ -345,77 +423,97 @@ def find_closest_text_and_update_db(svg_data, cursor, floor):
         else:
             return input_str
 
-    for point_id, x, y in anchor_points:
-        closest_text = None
-        closest_distance = float("inf")
+    texts = [text for text, _, _ in svg_data]
+    label_x = np.array([x for _, x, _ in svg_data], dtype=float)
+    label_y = np.array([y for _, _, y in svg_data], dtype=float)
+    point_x = np.array([x for _, x, _ in anchor_points], dtype=float)
+    point_y = np.array([y for _, _, y in anchor_points], dtype=float)
+
+    distances = np.sqrt(
+        (point_x[:, None] - label_x[None, :]) ** 2
+        + (point_y[:, None] - label_y[None, :]) ** 2
+    )
+    closest_labels = distances.argmin(axis=1)
+
+    numeric_labels = np.array([text is not None and dbs(text) for text in texts])
+    lift_stair_labels = [
+        text is not None and text.isdigit() and dbs(text) for text in texts
+    ]
+
+    updates = []
+    for row, (point_id, _, _) in enumerate(anchor_points):
+        closest_label = closest_labels[row]
+        closest_text = texts[closest_label]
         extra_info = None
         lift_stair_info = None
 
-        for text, x1, y1 in svg_data:
-            distance = calculate_distance(x1, y1, x, y)
-            if distance < closest_distance:
-                closest_distance = distance
-                closest_text = text
-
         if closest_text is None:
             continue
 
         if closest_text in {"T", "B", "G"}:
-            numeric_text = None
-            closest_numeric_distance = float("inf")
-
-            for text, x1, y1 in svg_data:
-                if dbs(text):
-                    distance = calculate_distance(x1, y1, x, y)
-                    if (
-                        distance < closest_numeric_distance
-                        and distance > closest_distance
-                    ):
-                        closest_numeric_distance = distance
-                        numeric_text = transform_room_section(text)
-
-            if numeric_text:
+            numeric_distances = np.where(
+                numeric_labels & (distances[row] > distances[row, closest_label]),
+                distances[row],
+                np.inf,
+            )
+            numeric_label = numeric_distances.argmin()
+
+            if np.isfinite(numeric_distances[numeric_label]):
+                numeric_text = transform_room_section(texts[numeric_label])
                 extra_info = f"{closest_text}{numeric_text}"
             else:
                 extra_info = closest_text
 
         if "Lift" in closest_text or "Stair" in closest_text:
 
-            nearby_texts = sorted(
-                svg_data, key=lambda t: calculate_distance(t[1], t[2], x, y)
-            )[:8]
+            nearby_labels = np.argsort(distances[row], kind="stable")[:8]
 
-            valid_texts = [
-                text for text, _, _ in nearby_texts if text.isdigit() and dbs(text)
-            ]
-
-            for valid_text in valid_texts:
-                if "27" in valid_text:
+            for label in nearby_labels:
+                if not lift_stair_labels[label]:
+                    continue
+                if "27" in texts[label]:
                     lift_stair_info = "Lift 3 and Stairs 3"
-                elif "4" in valid_text:
+                elif "4" in texts[label]:
                     lift_stair_info = "Lift 1 and Stairs 1"
-                elif "11" in valid_text:
+                elif "11" in texts[label]:
                     lift_stair_info = "Lift 2 and Stairs 2"
 
-        if closest_text is not None:
-            cursor.execute(
-                """
-                UPDATE anchor_point_description
-                SET description = ?, extra_info = ?
-                WHERE anchor_point_id = ? AND description = 'Unique anchor point'
-            """,
+        updates.append(
+            (
+                closest_text,
                 (
-                    closest_text,
-                    (
-                        f"{extra_info} | {lift_stair_info}"
-                        if lift_stair_info
-                        else extra_info
-                    ),
-                    point_id,
+                    f"{extra_info} | {lift_stair_info}"
+                    if lift_stair_info
+                    else extra_info
                 ),
+                point_id,
             )
+        )
+
+    cursor.executemany(
+        """
+        UPDATE anchor_point_description
+        SET description = ?, extra_info = ?
+        WHERE anchor_point_id = ? AND description = 'Unique anchor point'
+    """,
+        updates,
+    )
 
 
 if __name__ == "__main__":
-    with sqlite3.connect(loader.env_variables["db_path"]) as cursor:
-        create_teachers_database(cursor)
+    parser = argparse.ArgumentParser(description="Create or index the map database")
+    parser.add_argument(
+        "--db", type=str, default=loader.env_variables["db_path"], help="Map DB path"
+    )
+    parser.add_argument(
+        "--location-index",
+        action="store_true",
+        help="Rebuild the location lookup and full-text tables",
+    )
+    args = parser.parse_args()
+
+    if args.location_index:
+        build_location_index_for_db(args.db)
+    else:
+        with sqlite3.connect(args.db) as cursor:
+            create_teachers_database(cursor)
@@ -0,0 +1,244 @@
+import sqlite3
+import argparse
+from datetime import datetime
+from . import db_access, db_maker, loader
+
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_coordinates_floor "
+    "ON anchor_point_coordinates (floor)",
+    "CREATE INDEX IF NOT EXISTS idx_coordinates_position "
+    "ON anchor_point_coordinates (x_coordinate, y_coordinate, floor)",
+    "CREATE INDEX IF NOT EXISTS idx_description_anchor_point "
+    "ON anchor_point_description (anchor_point_id)",
+    "CREATE INDEX IF NOT EXISTS idx_connections_point_a ON connections (point_a_id)",
+    "CREATE INDEX IF NOT EXISTS idx_connections_point_b ON connections (point_b_id)",
+    "CREATE INDEX IF NOT EXISTS idx_teachers_cabin_no ON teachers (cabin_no)",
+    "CREATE INDEX IF NOT EXISTS idx_teachers_trimmed_cabin_no "
+    "ON teachers (TRIM(cabin_no))",
+    "CREATE INDEX IF NOT EXISTS idx_teachers_room_no ON teachers (room_no)",
+]
+
+MAP_TABLES = {"anchor_point_coordinates", "anchor_point_description", "connections"}
+
+# name -> (query, params, legacy). "before" plans profile the legacy query the
+# code ran before the location lookup migration, when there is one.
+HOT_QUERIES = {
+    "graph_converter.create_graphs_from_db nodes": (
+        """
+        SELECT id, x_coordinate, y_coordinate, floor
+        FROM anchor_point_coordinates
+        """,
+        (),
+        None,
+    ),
+    "graph_converter.create_graphs_from_db edges": (
+        """
+        SELECT c.point_a_id, c.point_b_id, c.distance, a.floor
+        FROM connections c
+        JOIN anchor_point_coordinates a ON a.id = c.point_a_id
+        JOIN anchor_point_coordinates b ON b.id = c.point_b_id
+        WHERE a.floor = b.floor
+        """,
+        (),
+        None,
+    ),
+    "graph_converter.get_vertical_points": (
+        """
+        SELECT anchor_point_id, TRIM(description)
+        FROM anchor_point_description
+        WHERE description LIKE 'Lift %' OR description LIKE 'Stairs %'
+        """,
+        (),
+        None,
+    ),
+    "db_access.get_coordinates": (
+        """
+        SELECT x_coordinate, y_coordinate
+        FROM location_lookup
+        WHERE normalized_name LIKE ? AND floor = ? AND source = 'description'
+        """,
+        ("Lift %", 0),
+        (db_access.LEGACY_COORDINATES_QUERY, ("Lift ", 0)),
+    ),
+    "db_access.search_locations exact": (
+        """
+        SELECT x_coordinate, y_coordinate, floor
+        FROM location_lookup
+        WHERE normalized_name = TRIM(?)
+        ORDER BY source, anchor_point_id
+        LIMIT 1
+        """,
+        ("Library",),
+        (db_access.LEGACY_THOROUGH_QUERY, ("Library", "Library")),
+    ),
+    "db_access.search_locations fts": (
+        """
+        SELECT x_coordinate, y_coordinate, floor
+        FROM location_fts
+        WHERE location_fts MATCH ?
+        ORDER BY rowid
+        LIMIT 1
+        """,
+        ('"Library"',),
+        (db_access.LEGACY_THOROUGH_QUERY, ("Library", "Library")),
+    ),
+    "db_access.get_description": (
+        """
+        SELECT apd.description
+        FROM anchor_point_coordinates apc
+        JOIN anchor_point_description apd ON apc.id = apd.anchor_point_id
+        WHERE apc.x_coordinate = ? AND apc.y_coordinate = ? AND apc.floor = ?
+        """,
+        (0.0, 0.0, 0),
+        None,
+    ),
+    "db_access.get_teacher_data": (
+        "SELECT name, cabin_no, room_no, phone_number FROM teachers "
+        "WHERE 1=1 AND cabin_no = ?",
+        ("A-502",),
+        None,
+    ),
+    "route_utilary.get_room_no_by_cabin": (
+        "SELECT room_no FROM teachers WHERE TRIM(cabin_no) = ?",
+        ("A-502",),
+        None,
+    ),
+    "db_maker.get_coordinate_ids": (
+        """
+        SELECT id, x_coordinate, y_coordinate FROM anchor_point_coordinates
+        WHERE floor = ?
+        ORDER BY id DESC
+        """,
+        (0,),
+        None,
+    ),
+}
+
+
+def create_base_tables(cursor):
+
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    tables = {row[0] for row in cursor.fetchall()}
+    if not MAP_TABLES <= tables:
+        db_maker.create_database(cursor)
+    if "teachers" not in tables:
+        db_maker.create_teachers_database(cursor)
+
+
+def add_map_indexes(cursor):
+
+    create_base_tables(cursor)
+    for statement in INDEXES:
+        cursor.execute(statement)
+    cursor.execute("ANALYZE")
+
+
+def add_location_index(cursor):
+
+    create_base_tables(cursor)
+    db_maker.build_location_index(cursor)
+
+
+MIGRATIONS = [
+    (1, "map indexes", add_map_indexes),
+    (2, "location lookup", add_location_index),
+]
+
+
+def get_schema_version(cursor):
+
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+        """
+    )
+    cursor.execute("SELECT MAX(version) FROM schema_version")
+    return cursor.fetchone()[0] or 0
+
+
+def query_plans(cursor, legacy=False):
+
+    plans = {}
+    for name, (query, params, legacy_query) in HOT_QUERIES.items():
+        if legacy and legacy_query:
+            query, params = legacy_query
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {query}", params)
+            plans[name] = [row[3] for row in cursor.fetchall()]
+        except sqlite3.OperationalError as e:
+            plans[name] = [f"unavailable: {e}"]
+    return plans
+
+
+def print_plan_report(before, after):
+
+    for name, (_, _, legacy_query) in HOT_QUERIES.items():
+        print(f"\n{name}")
+        if name in before:
+            print("  before (legacy query):" if legacy_query else "  before:")
+            for line in before[name]:
+                print(f"    {line}")
+        print("  after:")
+        for line in after[name]:
+            print(f"    {line}")
+
+
+def migrate(db_path, report=False):
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        cursor = conn.cursor()
+        current = get_schema_version(cursor)
+        before = query_plans(cursor, legacy=True) if report else None
+        applied = []
+
+        for version, name, migration in MIGRATIONS:
+            if version <= current:
+                continue
+            cursor.execute("BEGIN")
+            try:
+                migration(cursor)
+                cursor.execute(
+                    "INSERT INTO schema_version (version, name, applied_at) "
+                    "VALUES (?, ?, ?)",
+                    (version, name, datetime.now().isoformat()),
+                )
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            current = version
+            applied.append(version)
+            print(f"Applied migration {version}: {name}")
+
+        print(f"{db_path} is at schema version {current}.")
+        if report:
+            if not applied:
+                # Nothing ran, so only the legacy queries have a distinct plan.
+                print("No migrations applied; comparing against legacy queries only.")
+                before = {
+                    name: plan for name, plan in before.items() if HOT_QUERIES[name][2]
+                }
+            print_plan_report(before, query_plans(cursor))
+        return current
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate the map database schema")
+    parser.add_argument(
+        "--db", type=str, default=loader.env_variables["db_path"], help="Map DB path"
+    )
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="Print query plans of the hot queries before and after migrating",
+    )
+    args = parser.parse_args()
+    migrate(args.db, report=args.report)
@@ -1,7 +1,9 @@
 import sqlite3
 from . import db_access
 from . import graph_converter
+from . import graph_store
 from . import loader
+from . import route_table_maker
 
 
 class AmbiguousValueError(Exception):
@@ -70,6 +72,14 @@ def validate_and_process_start_end(start: str, end: str):
 
 def get_exact_node(graph, coordinates, floor):
 
+    index = graph.graph.get("coordinate_index")
+    if index is not None:
+        node = index.get((coordinates[0], coordinates[1], floor))
+        if node is not None:
+            return node
+        print("Exact node not found for the given coordinates.")
+        return None
+
     for node, data in graph.nodes(data=True):
         if (
             data["x"] == coordinates[0]
@@ -86,6 +96,37 @@ def interpret_path(graph, path):
     return [(graph.nodes[node]["x"], graph.nodes[node]["y"]) for node in path]
 
 
+def get_compact_graph(db_path, graph, node):
+
+    if loader.env_variables["routing_engine"] != "csr" or node not in graph:
+        return None
+    return graph_store.get_compact_graph(db_path, graph.nodes[node]["floor"])
+
+
+def find_shortest_path(db_path, graph, start_node, end_node):
+
+    result = route_table_maker.get_route_table(db_path).lookup(start_node, end_node)
+    if result is not None:
+        return result
+    compact = get_compact_graph(db_path, graph, start_node)
+    if compact is not None:
+        return compact.find_shortest_path(start_node, end_node)
+    return graph_converter.find_shortest_path(graph, start_node, end_node)
+
+
+def find_nearest_target(db_path, graph, start_node, target_nodes):
+
+    result = route_table_maker.get_route_table(db_path).nearest(
+        start_node, target_nodes
+    )
+    if result is not None:
+        return result
+    compact = get_compact_graph(db_path, graph, start_node)
+    if compact is not None:
+        return compact.find_nearest_target(start_node, target_nodes)
+    return graph_converter.find_nearest_target(graph, start_node, target_nodes)
+
+
 def get_lift_stairs(db_path, floor, graph, coords, preference):
 
     if preference == "Lift":
@@ -100,22 +141,18 @@ def get_lift_stairs(db_path, floor, graph, coords, preference):
     if not lifts_stairs_start:
         raise AmbiguousValueError(f"No lifts or stairs found on floor {floor}.")
 
-    min_weight = float("inf")
-    best_path_to_lift = None
-    best_lift = None
-
     start_node = get_exact_node(graph, coords, floor)
 
+    lift_stair_nodes = {}
     for lift_stair in lifts_stairs_start:
         lift_stair_node = get_exact_node(graph, lift_stair, floor)
-        path, weight = graph_converter.find_shortest_path(
-            graph, start_node, lift_stair_node
-        )
+        if lift_stair_node is not None:
+            lift_stair_nodes.setdefault(lift_stair_node, lift_stair)
 
-        if weight < min_weight:
-            min_weight = weight
-            best_path_to_lift = path
-            best_lift = lift_stair
+    best_node, best_path_to_lift, min_weight = find_nearest_target(
+        db_path, graph, start_node, lift_stair_nodes
+    )
+    best_lift = lift_stair_nodes.get(best_node)
 
     if not best_path_to_lift:
         raise AmbiguousValueError(f"Could not find a path to lifts or stairs '.")
@@ -127,10 +164,47 @@ def get_lift_stairs(db_path, floor, graph, coords, preference):
     }
 
 
+def find_multi_floor_path(
+    db_path, start_node, end_node, floor_start, floor_end, preference
+):
+
+    graph = graph_store.get_multi_floor_graph(db_path)
+    route_table = route_table_maker.get_route_table(db_path)
+
+    if route_table.is_fresh():
+        best = None
+        for lift_start, lift_end, weight in graph_converter.vertical_links(
+            graph, floor_start, floor_end, preference
+        ):
+            to_lift = route_table.distance(start_node, lift_start)
+            from_lift = route_table.distance(lift_end, end_node)
+            if to_lift is None or from_lift is None:
+                best = None
+                break
+            total_weight = to_lift + weight + from_lift
+            if best is None or total_weight < best[0]:
+                best = (total_weight, lift_start, lift_end)
+        if best is not None:
+            total_weight, lift_start, lift_end = best
+            path_to_lift, _ = route_table.lookup(start_node, lift_start)
+            path_from_lift, _ = route_table.lookup(lift_end, end_node)
+            return path_to_lift + path_from_lift, total_weight
+
+    if loader.env_variables["routing_engine"] == "csr":
+        return graph_store.get_compact_graph(db_path).find_shortest_path(
+            start_node, end_node, (floor_start, floor_end), preference
+        )
+
+    return graph_converter.find_shortest_path(
+        graph,
+        start_node,
+        end_node,
+        weight=graph_converter.floor_change_weight(floor_start, floor_end, preference),
+    )
+
+
 def handle_different_msb(
     db_path,
-    graph_start,
-    graph_end,
     start_coords,
     end_coords,
     floor_start,
@@ -140,36 +214,37 @@ def handle_different_msb(
 
     try:
 
-        lift_stairs = get_lift_stairs(
-            db_path, floor_start, graph_start, start_coords, preference
-        )
+        graph = graph_store.get_multi_floor_graph(db_path)
 
-        lift_description = db_access.get_description(
-            db_path, lift_stairs["best_lift"], floor_start
-        )
-        lift_coords_end = db_access.get_coordinates(
-            db_path, lift_description[0], floor_end
-        )
-        if not lift_coords_end:
+        start_node = get_exact_node(graph, start_coords, floor_start)
+        end_node = get_exact_node(graph, end_coords, floor_end)
+        if start_node is None or end_node is None:
             raise AmbiguousValueError(
-                f"Matching lift/stair '{lift_description}' not found on floor {floor_end}."
+                "Could not determine start or end node in the graph."
             )
-        lift_node_end = get_exact_node(graph_end, lift_coords_end[0], floor_end)
-
-        end_node = get_exact_node(graph_end, end_coords, floor_end)
 
-        path_from_lift, weight_from_lift = graph_converter.find_shortest_path(
-            graph_end, lift_node_end, end_node
+        path, total_weight = find_multi_floor_path(
+            db_path, start_node, end_node, floor_start, floor_end, preference
         )
+        if not path:
+            raise AmbiguousValueError(
+                f"Could not find a path between floor {floor_start} and floor {floor_end}."
+            )
 
         combined_path = [
             [
                 floor_start,
-                interpret_path(graph_start, lift_stairs["best_path_to_lift"]),
+                interpret_path(
+                    graph, [n for n in path if graph.nodes[n]["floor"] == floor_start]
+                ),
+            ],
+            [
+                floor_end,
+                interpret_path(
+                    graph, [n for n in path if graph.nodes[n]["floor"] == floor_end]
+                ),
             ],
-            [floor_end, interpret_path(graph_end, path_from_lift)],
         ]
-        total_weight = lift_stairs["min_weight"] + weight_from_lift
 
         return {
             "path": combined_path,
@@ -207,9 +282,9 @@ def main(
             start_description, end_description
         )
 
-        graph_start = graph_converter.create_graph_from_db(db_path, floor_start)
+        graph_start = graph_store.get_graph(db_path, floor_start)
         graph_end = (
-            graph_converter.create_graph_from_db(db_path, floor_end)
+            graph_store.get_graph(db_path, floor_end)
             if floor_start != floor_end
             else graph_start
         )
@@ -227,7 +302,7 @@ def main(
                     f"Start location '{start_description}' not found anywhere in the database."
                 )
             start_coords, floor_start = thorough_result[0:2], thorough_result[2]
-            graph_start = graph_converter.create_graph_from_db(db_path, floor_start)
+            graph_start = graph_store.get_graph(db_path, floor_start)
 
         end_coords = db_access.get_coordinates(db_path, end_description, floor_end)
         if not end_coords:
@@ -240,7 +315,7 @@ def main(
                     f"End location '{end_description}' not found anywhere in the database."
                 )
             end_coords, floor_end = thorough_result[0:2], thorough_result[2]
-            graph_end = graph_converter.create_graph_from_db(db_path, floor_end)
+            graph_end = graph_store.get_graph(db_path, floor_end)
 
         if len(start_coords) == 1:
             start_coords = start_coords[0]
@@ -277,8 +352,8 @@ def main(
                     "Could not determine start or end node in the graph."
                 )
 
-            shortest_path, weight = graph_converter.find_shortest_path(
-                graph_start, start_node, end_node
+            shortest_path, weight = find_shortest_path(
+                db_path, graph_start, start_node, end_node
             )
 
             return {
@@ -291,8 +366,6 @@ def main(
         else:
             return handle_different_msb(
                 db_path,
-                graph_start,
-                graph_end,
                 start_coords,
                 end_coords,
                 floor_start,
@@ -2,9 +2,32 @@ from typing import List, Tuple
 from math import sqrt
 import xml.etree.ElementTree as ET
 from typing import List, Tuple, Set
+import argparse
 import traceback
 
 
+SVG_NAMESPACE = "http://www.w3.org/2000/svg"
+POLYLINE_TAG = f"{{{SVG_NAMESPACE}}}polyline"
+GROUP_TAG = f"{{{SVG_NAMESPACE}}}g"
+
+
+def parse_polyline_points(points_str: str) -> List[Tuple[float, float]]:
+
+    coords = points_str.strip().split()
+    points = []
+
+    for i in range(0, len(coords), 2):
+        try:
+            x = float(coords[i])
+            y = float(coords[i + 1])
+            points.append((x, y))
+        except (IndexError, ValueError) as e:
+            print(f"Error parsing coordinates {coords[i:i+2]}: {e}")
+            continue
+
+    return points
+
+
 def process_polylines(
     root: ET.Element, namespace: dict
 ) -> Tuple[
@@ -18,17 +41,7 @@ def process_polylines(
         points_str = polyline.get("points")
         if points_str:
 
-            coords = points_str.strip().split()
-            points = []
-
-            for i in range(0, len(coords), 2):
-                try:
-                    x = float(coords[i])
-                    y = float(coords[i + 1])
-                    points.append((x, y))
-                except (IndexError, ValueError) as e:
-                    print(f"Error parsing coordinates {coords[i:i+2]}: {e}")
-                    continue
+            points = parse_polyline_points(points_str)
 
             for i in range(len(points)):
                 anchor_points.add(points[i])
@@ -80,8 +93,76 @@ def add_distances_to_list(
     ]
 
 
+def iter_path_elements(filepath: str):
+
+    depth = 0
+    for event, elem in ET.iterparse(filepath, events=("start", "end")):
+        if event == "start":
+            if depth:
+                depth += 1
+            elif elem.tag == GROUP_TAG and elem.get("id") == "Path":
+                depth = 1
+            continue
+
+        if depth:
+            depth -= 1
+            if elem.tag == POLYLINE_TAG or elem.tag.rsplit("}", 1)[-1] == "line":
+                yield elem
+            if not depth:
+                return
+        elem.clear()
+
+
+def iter_svg_geometry(filepath: str):
+
+    for elem in iter_path_elements(filepath):
+        if elem.tag == POLYLINE_TAG:
+            points = parse_polyline_points(elem.get("points") or "")
+            for i, point in enumerate(points):
+                yield "point", point
+                if i:
+                    yield "segment", (points[i - 1], point)
+            continue
+
+        try:
+            point1 = (float(elem.get("x1", 0)), float(elem.get("y1", 0)))
+            point2 = (float(elem.get("x2", 0)), float(elem.get("y2", 0)))
+        except ValueError as e:
+            print(f"Warning: Error parsing line coordinates")
+            print(f"Error: {e}")
+            continue
+
+        yield "point", point1
+        yield "point", point2
+        yield "segment", (point1, point2)
+
+
+def write_debug_output(output_file, anchor_points_list, connections_list):
+
+    point_ids = {point: i for i, point in enumerate(anchor_points_list, 1)}
+
+    with open(output_file, "w") as f:
+        f.write("Anchor Points:\n")
+        for i, point in enumerate(anchor_points_list, 1):
+            f.write(f"{i}. ({point[0]:.2f}, {point[1]:.2f})\n")
+
+        f.write("\nConnections:\n")
+        for i, conn in enumerate(connections_list, start=1):
+
+            start_point, end_point = conn[0]
+            distance = conn[1]
+            f.write(
+                f"{i}. Point {point_ids[start_point]} to Point {point_ids[end_point]} (Distance: {distance:.2f})\n"
+            )
+            f.write(
+                f"   ({start_point[0]:.2f}, {start_point[1]:.2f}) -> ({end_point[0]:.2f}, {end_point[1]:.2f})\n"
+            )
+
+
 def process_svg_file(
     filepath: str,
+    streaming: bool = False,
+    debug_output: str = None,
 ) -> Tuple[
     list[Tuple[float, float]],
     List[Tuple[Tuple[Tuple[float, float], Tuple[float, float]], float]],
@@ -89,16 +170,25 @@ def process_svg_file(
 
     try:
 
-        namespace = {"svg": "http://www.w3.org/2000/svg"}
+        if streaming:
+            all_points = set()
+            all_connections = set()
+            for kind, item in iter_svg_geometry(filepath):
+                if kind == "point":
+                    all_points.add(item)
+                else:
+                    all_connections.add(item)
+        else:
+            namespace = {"svg": SVG_NAMESPACE}
 
-        tree = ET.parse(filepath)
-        root = tree.getroot().find(".//svg:g[@id='Path']", namespace)
+            tree = ET.parse(filepath)
+            root = tree.getroot().find(".//svg:g[@id='Path']", namespace)
 
-        polyline_points, polyline_connections = process_polylines(root, namespace)
-        line_points, line_connections = process_lines(root)
+            polyline_points, polyline_connections = process_polylines(root, namespace)
+            line_points, line_connections = process_lines(root)
 
-        all_points = polyline_points.union(line_points)
-        all_connections = polyline_connections.union(line_connections)
+            all_points = polyline_points.union(line_points)
+            all_connections = polyline_connections.union(line_connections)
 
         anchor_points_list = sorted(all_points)
         connections_list = add_distances_to_list(sorted(all_connections))
@@ -106,24 +196,8 @@ def process_svg_file(
         print(f"\nTotal anchor points: {len(anchor_points_list)}")
         print(f"Total connections: {len(connections_list)}")
 
-        with open("extracted_data.txt", "w") as f:
-            f.write("Anchor Points:\n")
-            for i, point in enumerate(anchor_points_list, 1):
-                f.write(f"{i}. ({point[0]:.2f}, {point[1]:.2f})\n")
-
-            f.write("\nConnections:\n")
-            for i, conn in enumerate(connections_list, start=1):
-
-                start_point, end_point = conn[0]
-                distance = conn[1]
-                start_idx = anchor_points_list.index(start_point) + 1
-                end_idx = anchor_points_list.index(end_point) + 1
-                f.write(
-                    f"{i}. Point {start_idx} to Point {end_idx} (Distance: {distance:.2f})\n"
-                )
-                f.write(
-                    f"   ({start_point[0]:.2f}, {start_point[1]:.2f}) -> ({end_point[0]:.2f}, {end_point[1]:.2f})\n"
-                )
+        if debug_output:
+            write_debug_output(debug_output, anchor_points_list, connections_list)
 
         return anchor_points_list, connections_list
 
@@ -140,5 +214,13 @@ def process_svg_file(
 
 
 if __name__ == "__main__":
-    svg_file = r"floor 2 copy path.svg"
-    process_svg_file(svg_file)
+    parser = argparse.ArgumentParser(description="Extract path geometry from an SVG")
+    parser.add_argument("svg_file", nargs="?", default="floor 2 copy path.svg")
+    parser.add_argument(
+        "--stream", action="store_true", help="Parse incrementally with iterparse"
+    )
+    parser.add_argument("--debug-output", type=str, default="extracted_data.txt")
+    args = parser.parse_args()
+    process_svg_file(
+        args.svg_file, streaming=args.stream, debug_output=args.debug_output
+    )
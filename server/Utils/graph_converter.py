@@ -1,9 +1,17 @@
 import networkx as nx
+import numpy as np
+import re
+from heapq import heappush, heappop
+from math import sqrt
 from typing import List, Tuple
 from . import extractor, loader
 import sqlite3
 
 
+FLOOR_CHANGE_WEIGHTS = {"Lift": 10.0, "Stairs": 15.0}
+EDGE_KINDS = {None: 0, "Lift": 1, "Stairs": 2}
+
+
 def create_graph_from_svg_data(
     anchor_points: List[Tuple[float, float]],
     connections: List[Tuple[Tuple[Tuple[float, float], Tuple[float, float]], float]],
@@ -22,6 +30,15 @@ def create_graph_from_svg_data(
     return G
 
 
+def build_coordinate_index(G: nx.Graph) -> nx.Graph:
+
+    index = {}
+    for node, data in G.nodes(data=True):
+        index.setdefault((data["x"], data["y"], data["floor"]), node)
+    G.graph["coordinate_index"] = index
+    return G
+
+
 def is_graph_connected(db_path, floor):
 
     G = create_graph_from_db(db_path, floor)
@@ -78,7 +95,93 @@ def create_graph_from_db(db_path, floor):
             point_a_id, point_b_id, distance = edge
             G.add_edge(point_a_id, point_b_id, weight=distance)
 
-        return G
+        return build_coordinate_index(G)
+    except sqlite3.Error as e:
+        raise RuntimeError(f"Database error: {e}")
+    finally:
+
+        conn.close()
+
+
+def read_graphs(cursor):
+
+    cursor.execute(
+        """
+        SELECT id, x_coordinate, y_coordinate, floor
+        FROM anchor_point_coordinates
+    """
+    )
+    nodes = cursor.fetchall()
+
+    cursor.execute(
+        """
+        SELECT c.point_a_id, c.point_b_id, c.distance, a.floor
+        FROM connections c
+        JOIN anchor_point_coordinates a ON a.id = c.point_a_id
+        JOIN anchor_point_coordinates b ON b.id = c.point_b_id
+        WHERE a.floor = b.floor
+    """
+    )
+    edges = cursor.fetchall()
+
+    graphs = {}
+
+    for node in nodes:
+        node_id, x, y, node_floor = node
+        G = graphs.setdefault(node_floor, nx.Graph())
+        G.add_node(node_id, x=x, y=y, floor=node_floor)
+
+    for edge in edges:
+        point_a_id, point_b_id, distance, edge_floor = edge
+        graphs[edge_floor].add_edge(point_a_id, point_b_id, weight=distance)
+
+    for G in graphs.values():
+        build_coordinate_index(G)
+
+    return graphs
+
+
+def read_vertical_points(cursor):
+
+    cursor.execute(
+        """
+        SELECT anchor_point_id, TRIM(description)
+        FROM anchor_point_description
+        WHERE description LIKE 'Lift %' OR description LIKE 'Stairs %'
+    """
+    )
+
+    vertical_points = []
+    for anchor_point_id, description in cursor.fetchall():
+        match = re.fullmatch(r"(Lift|Stairs) (\d+)", description)
+        if match:
+            vertical_points.append((anchor_point_id, match.group(1), description))
+    return vertical_points
+
+
+def create_graphs_from_db(db_path):
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+
+        return read_graphs(cursor)
+    except sqlite3.Error as e:
+        raise RuntimeError(f"Database error: {e}")
+    finally:
+
+        conn.close()
+
+
+def get_vertical_points(db_path):
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+
+        return read_vertical_points(cursor)
     except sqlite3.Error as e:
         raise RuntimeError(f"Database error: {e}")
     finally:
@@ -86,17 +189,131 @@ def create_graph_from_db(db_path, floor):
         conn.close()
 
 
+def create_multi_floor_graph(graphs, vertical_points) -> nx.Graph:
+
+    G = nx.Graph()
+    index = {}
+
+    for floor, floor_graph in graphs.items():
+        G.add_nodes_from(floor_graph.nodes(data=True))
+        for u, v, data in floor_graph.edges(data=True):
+            G.add_edge(u, v, weight=data["weight"], floor=floor)
+        for key, node in floor_graph.graph.get("coordinate_index", {}).items():
+            index.setdefault(key, node)
+
+    by_label = {}
+    for node, kind, label in vertical_points:
+        if node in G:
+            by_label.setdefault(label, []).append((node, kind))
+
+    for label, points in by_label.items():
+        for i, (u, kind) in enumerate(points):
+            for v, _ in points[i + 1 :]:
+                floor_u, floor_v = G.nodes[u]["floor"], G.nodes[v]["floor"]
+                if floor_u == floor_v:
+                    continue
+                G.add_edge(
+                    u,
+                    v,
+                    weight=FLOOR_CHANGE_WEIGHTS[kind] * abs(floor_u - floor_v),
+                    kind=kind,
+                    floors=frozenset((floor_u, floor_v)),
+                )
+
+    G.graph["coordinate_index"] = index
+    G.graph["vertical_links"] = index_vertical_links(G)
+    return G
+
+
+def index_vertical_links(graph: nx.Graph):
+
+    links = {}
+    for u, v, data in graph.edges(data=True):
+        if data.get("kind") is not None:
+            links.setdefault(data["floors"], []).append((u, v, data))
+    return links
+
+
+def floor_change_weight(floor_start, floor_end, preference=None):
+
+    floors = frozenset((floor_start, floor_end))
+
+    def weight(u, v, data):
+
+        kind = data.get("kind")
+        if kind is None:
+            return data["weight"] if data["floor"] in floors else None
+        if data["floors"] != floors:
+            return None
+        if preference in FLOOR_CHANGE_WEIGHTS and kind != preference:
+            return None
+        return data["weight"]
+
+    return weight
+
+
+def vertical_links(graph: nx.Graph, floor_start, floor_end, preference=None):
+
+    links = graph.graph.get("vertical_links")
+    if links is None:
+        links = index_vertical_links(graph)
+
+    weight = floor_change_weight(floor_start, floor_end, preference)
+    for u, v, data in links.get(frozenset((floor_start, floor_end)), ()):
+        if weight(u, v, data) is None:
+            continue
+        if graph.nodes[u]["floor"] == floor_start:
+            yield u, v, data["weight"]
+        else:
+            yield v, u, data["weight"]
+
+
+def euclidean_heuristic(graph: nx.Graph):
+
+    nodes = graph.nodes
+
+    def heuristic(u, v):
+
+        a, b = nodes[u], nodes[v]
+        if a["floor"] != b["floor"]:
+            return 0
+        return sqrt((b["x"] - a["x"]) ** 2 + (b["y"] - a["y"]) ** 2)
+
+    return heuristic
+
+
+def path_weight(graph: nx.Graph, path, weight="weight") -> float:
+
+    if not callable(weight):
+        return nx.path_weight(graph, path, weight=weight)
+    return sum(weight(u, v, graph.edges[u, v]) for u, v in zip(path, path[1:]))
+
+
 def find_shortest_path(
-    graph: nx.Graph, start: Tuple[float, float], end: Tuple[float, float]
+    graph: nx.Graph,
+    start: Tuple[float, float],
+    end: Tuple[float, float],
+    method: str = None,
+    weight="weight",
 ) -> Tuple[List[Tuple[float, float]], float]:
 
-    try:
+    method = method or loader.env_variables["routing_algorithm"]
 
-        path = nx.dijkstra_path(graph, source=start, target=end, weight="weight")
+    try:
 
-        total_weight = nx.dijkstra_path_length(
-            graph, source=start, target=end, weight="weight"
-        )
+        if method == "astar":
+            path = nx.astar_path(
+                graph,
+                source=start,
+                target=end,
+                heuristic=euclidean_heuristic(graph),
+                weight=weight,
+            )
+            total_weight = path_weight(graph, path, weight=weight)
+        else:
+            total_weight, path = nx.single_source_dijkstra(
+                graph, source=start, target=end, weight=weight
+            )
         return path, total_weight
     except nx.NetworkXNoPath:
         print(f"No path found between {start} and {end}.")
@@ -104,6 +321,157 @@ def find_shortest_path(
         return [], float("inf")
 
 
+def find_nearest_target(graph: nx.Graph, start, targets) -> Tuple[object, List, float]:
+
+    targets = {target for target in targets if target in graph}
+    if start not in graph or not targets:
+        return None, [], float("inf")
+
+    try:
+
+        total_weight, path = nx.multi_source_dijkstra(
+            graph, sources=targets, target=start, weight="weight"
+        )
+    except nx.NetworkXNoPath:
+        print(f"No path found between {start} and any of {targets}.")
+
+        return None, [], float("inf")
+
+    path.reverse()
+    return path[-1], path, total_weight
+
+
+class CompactGraph:
+
+    def __init__(self, graph: nx.Graph):
+
+        self.source = graph
+        nodes = list(graph.nodes)
+        self.index = {node: i for i, node in enumerate(nodes)}
+        self.node_ids = np.array(nodes, dtype=np.int64)
+        self.x = np.array([graph.nodes[n]["x"] for n in nodes], dtype=np.float64)
+        self.y = np.array([graph.nodes[n]["y"] for n in nodes], dtype=np.float64)
+        self.floor = np.array([graph.nodes[n]["floor"] for n in nodes], dtype=np.int16)
+
+        adjacency = [[] for _ in nodes]
+        for u, v, data in graph.edges(data=True):
+            i, j = self.index[u], self.index[v]
+            kind = EDGE_KINDS[data.get("kind")]
+            adjacency[i].append((j, data["weight"], kind))
+            adjacency[j].append((i, data["weight"], kind))
+
+        self.indptr = np.zeros(len(nodes) + 1, dtype=np.int32)
+        self.indptr[1:] = np.cumsum([len(edges) for edges in adjacency])
+        flat = [edge for edges in adjacency for edge in edges]
+        self.indices = np.array([e[0] for e in flat], dtype=np.int32)
+        self.weights = np.array([e[1] for e in flat], dtype=np.float64)
+        self.kinds = np.array([e[2] for e in flat], dtype=np.int8)
+
+        self._lists = (
+            self.indptr.tolist(),
+            self.indices.tolist(),
+            self.weights.tolist(),
+            self.kinds.tolist(),
+            self.floor.tolist(),
+            self.x.tolist(),
+            self.y.tolist(),
+        )
+
+    def _search(self, sources, target, floors=None, preference=None, method=None):
+
+        indptr, indices, weights, kinds, floor, xs, ys = self._lists
+        astar = (method or loader.env_variables["routing_algorithm"]) == "astar"
+        allowed_kinds = (
+            {EDGE_KINDS[preference]}
+            if preference in FLOOR_CHANGE_WEIGHTS
+            else {EDGE_KINDS["Lift"], EDGE_KINDS["Stairs"]}
+        )
+        tx, ty, tf = xs[target], ys[target], floor[target]
+
+        inf = float("inf")
+        dist = [inf] * len(floor)
+        prev = [-1] * len(floor)
+        done = [False] * len(floor)
+        heap = []
+        for source in sources:
+            dist[source] = 0.0
+            heappush(heap, (0.0, 0.0, source))
+
+        while heap:
+            _, d, u = heappop(heap)
+            if done[u]:
+                continue
+            if u == target:
+                break
+            done[u] = True
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                if floors is not None:
+                    if kinds[k] == 0:
+                        if floor[u] not in floors:
+                            continue
+                    elif (
+                        kinds[k] not in allowed_kinds
+                        or floor[u] == floor[v]
+                        or floor[u] not in floors
+                        or floor[v] not in floors
+                    ):
+                        continue
+                nd = d + weights[k]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    prev[v] = u
+                    h = 0.0
+                    if astar and floor[v] == tf:
+                        h = sqrt((tx - xs[v]) ** 2 + (ty - ys[v]) ** 2)
+                    heappush(heap, (nd + h, nd, v))
+
+        if dist[target] == inf:
+            return [], inf
+
+        path = [target]
+        while prev[path[-1]] != -1:
+            path.append(prev[path[-1]])
+        path.reverse()
+        return path, dist[target]
+
+    def find_shortest_path(
+        self, start, end, floors=None, preference=None, method=None
+    ) -> Tuple[List, float]:
+
+        if start not in self.index or end not in self.index:
+            return [], float("inf")
+
+        path, total_weight = self._search(
+            [self.index[start]],
+            self.index[end],
+            frozenset(floors) if floors is not None else None,
+            preference,
+            method,
+        )
+        if not path:
+            print(f"No path found between {start} and {end}.")
+        return [int(self.node_ids[i]) for i in path], total_weight
+
+    def find_nearest_target(self, start, targets) -> Tuple[object, List, float]:
+
+        sources = [self.index[t] for t in targets if t in self.index]
+        if start not in self.index or not sources:
+            return None, [], float("inf")
+
+        path, total_weight = self._search(sources, self.index[start], method="dijkstra")
+        if not path:
+            print(f"No path found between {start} and any of {set(targets)}.")
+            return None, [], float("inf")
+
+        path.reverse()
+        return (
+            int(self.node_ids[path[-1]]),
+            [int(self.node_ids[i]) for i in path],
+            total_weight,
+        )
+
+
 def example():
 
     db_path = loader.env_variables["db_path"]
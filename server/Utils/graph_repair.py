@@ -0,0 +1,315 @@
+import os
+import re
+import json
+import shutil
+import argparse
+import networkx as nx
+from lxml import etree as ET
+from math import floor
+from typing import Dict, List, Tuple
+from . import db_maker, extractor, loader
+
+
+Point = Tuple[float, float]
+Segment = Tuple[Point, Point]
+
+SVG_NAMESPACE = "http://www.w3.org/2000/svg"
+GEOMETRY_ATTRIBUTES = {"points", "x1", "y1", "x2", "y2"}
+
+
+class SpatialHash:
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def cell(self, x, y):
+
+        return floor(x / self.cell_size), floor(y / self.cell_size)
+
+    def insert(self, item, min_x, min_y, max_x=None, max_y=None):
+
+        x0, y0 = self.cell(min_x, min_y)
+        x1, y1 = self.cell(
+            min_x if max_x is None else max_x, min_y if max_y is None else max_y
+        )
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), []).append(item)
+
+    def near(self, x, y):
+
+        cx, cy = self.cell(x, y)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                yield from self.cells.get((cx + dx, cy + dy), ())
+
+
+def squared_distance(a: Point, b: Point) -> float:
+
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2
+
+
+def snap_points(
+    points: List[Point], segments: List[Segment], tolerance: float
+) -> Dict[Point, Point]:
+
+    degree = {point: 0 for point in points}
+    for a, b in segments:
+        for point in (a, b):
+            degree[point] = degree.get(point, 0) + 1
+
+    # Only dangling endpoints move, and each moves onto a representative that
+    # never moves itself, so no point ends up more than tolerance away.
+    grid = SpatialHash(tolerance)
+    limit = tolerance**2
+    snapped = {}
+    for point in sorted(degree):
+        if degree[point] != 1:
+            snapped[point] = point
+            grid.insert(point, *point)
+
+    for point in sorted(point for point, count in degree.items() if count == 1):
+        nearby = [
+            (squared_distance(point, other), other) for other in grid.near(*point)
+        ]
+        nearby = [item for item in nearby if item[0] <= limit]
+        if nearby:
+            snapped[point] = min(nearby)[1]
+        else:
+            snapped[point] = point
+            grid.insert(point, *point)
+
+    return snapped
+
+
+def split_t_junctions(
+    points: List[Point], segments: List[Segment], tolerance: float
+) -> Tuple[List[Segment], int]:
+
+    grid = SpatialHash(max(tolerance, 1.0) * 8)
+    for index, (a, b) in enumerate(segments):
+        grid.insert(
+            index,
+            min(a[0], b[0]) - tolerance,
+            min(a[1], b[1]) - tolerance,
+            max(a[0], b[0]) + tolerance,
+            max(a[1], b[1]) + tolerance,
+        )
+
+    limit = tolerance**2
+    splits = {}
+    for point in points:
+        for index in set(grid.near(*point)):
+            a, b = segments[index]
+            if point in (a, b):
+                continue
+            dx, dy = b[0] - a[0], b[1] - a[1]
+            length = dx * dx + dy * dy
+            if not length:
+                continue
+            t = ((point[0] - a[0]) * dx + (point[1] - a[1]) * dy) / length
+            projection = (a[0] + t * dx, a[1] + t * dy)
+            if (
+                0 < t < 1
+                and squared_distance(point, projection) <= limit
+                and squared_distance(point, a) > limit
+                and squared_distance(point, b) > limit
+            ):
+                splits.setdefault(index, {})[point] = t
+
+    repaired = []
+    for index, (a, b) in enumerate(segments):
+        chain = [a]
+        chain.extend(sorted(splits.get(index, {}), key=splits.get(index, {}).get))
+        chain.append(b)
+        repaired.extend(zip(chain, chain[1:]))
+
+    return repaired, len(splits)
+
+
+def connectivity_report(points: List[Point], segments: List[Segment]) -> dict:
+
+    G = nx.Graph()
+    G.add_nodes_from(points)
+    G.add_edges_from(segments)
+    components = sorted(nx.connected_components(G), key=len, reverse=True)
+
+    return {
+        "nodes": G.number_of_nodes(),
+        "edges": G.number_of_edges(),
+        "components": len(components),
+        "component_sizes": [len(component) for component in components],
+        "isolated_points": sorted(nx.isolates(G)),
+        "stray_components": [sorted(component) for component in components[1:]],
+    }
+
+
+def repair_graph(points, connections, tolerance=1.0):
+
+    if not tolerance > 0:
+        raise ValueError(f"Tolerance must be positive, got {tolerance}")
+
+    segments = [segment for segment, _ in connections]
+    before = connectivity_report(points, segments)
+
+    snapped = snap_points(points, segments, tolerance)
+    snapped_points = sorted(set(snapped.values()))
+    snapped_segments = [(snapped[a], snapped[b]) for a, b in segments]
+
+    split_segments, split_count = split_t_junctions(
+        snapped_points, snapped_segments, tolerance
+    )
+
+    seen = set()
+    repaired_segments = []
+    for a, b in split_segments:
+        key = frozenset((a, b))
+        if a != b and key not in seen:
+            seen.add(key)
+            repaired_segments.append((a, b))
+
+    repaired_points = sorted(
+        set(snapped_points).union(*repaired_segments)
+        if repaired_segments
+        else snapped_points
+    )
+    repaired_connections = extractor.add_distances_to_list(sorted(repaired_segments))
+
+    report = {
+        "tolerance": tolerance,
+        "snapped_points": sum(
+            1 for point, target in snapped.items() if point != target
+        ),
+        "split_segments": split_count,
+        "before": before,
+        "after": connectivity_report(repaired_points, repaired_segments),
+    }
+    return repaired_points, repaired_connections, report
+
+
+def positive_float(value):
+
+    tolerance = float(value)
+    if not tolerance > 0:
+        raise argparse.ArgumentTypeError(f"must be positive, got {value}")
+    return tolerance
+
+
+def floor_from_filename(svg_file):
+
+    digits = re.findall(r"\d", os.path.basename(svg_file))
+    return int(digits[0]) if digits else None
+
+
+def write_path_layer(svg_file, connections, output_file):
+
+    tree = ET.parse(svg_file)
+    group = tree.getroot().find(
+        ".//svg:g[@id='Path']", namespaces={"svg": SVG_NAMESPACE}
+    )
+    if group is None:
+        raise ValueError(f"No Path layer found in {svg_file}")
+
+    drawn = list(group.iter(f"{{{SVG_NAMESPACE}}}polyline", f"{{{SVG_NAMESPACE}}}line"))
+    style = {
+        key: value
+        for key, value in (drawn[0].attrib.items() if drawn else ())
+        if key not in GEOMETRY_ATTRIBUTES
+    }
+    for elem in drawn:
+        elem.getparent().remove(elem)
+
+    for (a, b), _ in connections:
+        ET.SubElement(
+            group,
+            f"{{{SVG_NAMESPACE}}}line",
+            {
+                **style,
+                "x1": str(a[0]),
+                "y1": str(a[1]),
+                "x2": str(b[0]),
+                "y2": str(b[1]),
+            },
+        )
+
+    tree.write(output_file, pretty_print=True, xml_declaration=True, encoding="utf-8")
+    return output_file
+
+
+def repair_floor_maps(floor_map_dir, tolerance=1.0, db_path=None, output_dir=None):
+
+    # The renderer highlights the drawn <line>s that match graph edges, so an
+    # imported repair must ship with floor maps drawing the same geometry.
+    if db_path and not output_dir:
+        raise ValueError("Importing repaired floors requires an output_dir")
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    reports = {}
+    for name in sorted(os.listdir(floor_map_dir)):
+        floor_number = floor_from_filename(name)
+        if not name.endswith(".svg") or floor_number is None:
+            continue
+
+        svg_file = os.path.join(floor_map_dir, name)
+        points, connections = extractor.process_svg_file(svg_file, streaming=True)
+        if not points:
+            if output_dir and not os.path.samefile(floor_map_dir, output_dir):
+                shutil.copy2(svg_file, os.path.join(output_dir, name))
+            continue
+
+        points, connections, report = repair_graph(points, connections, tolerance)
+        reports[floor_number] = {"file": name, **report}
+        print(
+            f"Floor {floor_number}: {report['before']['components']} -> "
+            f"{report['after']['components']} components, "
+            f"{report['snapped_points']} points snapped, "
+            f"{report['split_segments']} segments split"
+        )
+
+        if output_dir:
+            svg_file = write_path_layer(
+                svg_file, connections, os.path.join(output_dir, name)
+            )
+        if db_path:
+            db_maker.process_svg_data(svg_file, points, connections, db_path)
+
+    return reports
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Snap and split floor map paths and report their connectivity"
+    )
+    parser.add_argument(
+        "--floor-maps", type=str, default=loader.env_variables["floor_map"]
+    )
+    parser.add_argument(
+        "--tolerance", type=positive_float, default=1.0, help="SVG units"
+    )
+    parser.add_argument(
+        "--report", type=str, default="connectivity_report.json", help="Output JSON"
+    )
+    parser.add_argument(
+        "--db",
+        type=str,
+        default=None,
+        help="Also import the repaired floors into this (new) map database",
+    )
+    parser.add_argument(
+        "--output-maps",
+        type=str,
+        default=None,
+        help="Write floor maps with the repaired Path layer to this directory",
+    )
+    args = parser.parse_args()
+    if args.db and not args.output_maps:
+        parser.error("--db requires --output-maps so the drawn paths match the DB")
+
+    reports = repair_floor_maps(
+        args.floor_maps, args.tolerance, args.db, args.output_maps
+    )
+    with open(args.report, "w") as f:
+        json.dump(reports, f, indent=2)
+    print(f"Connectivity report written to {args.report}")
@@ -0,0 +1,83 @@
+import sqlite3
+import networkx as nx
+from . import graph_converter, loader
+from .refreshing_index import RefreshingIndex, get_index
+
+
+class GraphStore(RefreshingIndex):
+
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self._graphs = {}
+        self._multi_floor_graph = nx.Graph()
+        self._compact_graphs = {}
+
+    def build(self, conn):
+
+        cursor = conn.cursor()
+        try:
+            graphs = graph_converter.read_graphs(cursor)
+            vertical_points = graph_converter.read_vertical_points(cursor)
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Database error: {e}")
+
+        self._multi_floor_graph = graph_converter.create_multi_floor_graph(
+            graphs, vertical_points
+        )
+        self._graphs = graphs
+        self._compact_graphs = {}
+
+    def graphs(self):
+
+        self.refresh()
+        return self._graphs
+
+    def multi_floor_graph(self):
+
+        self.refresh()
+        return self._multi_floor_graph
+
+    def compact_graph(self, floor=None):
+
+        graph = self.multi_floor_graph() if floor is None else self.get_graph(floor)
+        key = None if floor is None else int(floor)
+        compact = self._compact_graphs.get(key)
+        if compact is None or compact.source is not graph:
+            compact = graph_converter.CompactGraph(graph)
+            self._compact_graphs[key] = compact
+        return compact
+
+    def get_graph(self, floor):
+
+        graph = self.graphs().get(int(floor))
+        return graph if graph is not None else nx.Graph()
+
+
+def get_store(db_path=None):
+
+    return get_index(GraphStore, db_path or loader.env_variables["db_path"])
+
+
+def get_graph(db_path, floor):
+
+    return get_store(db_path).get_graph(floor)
+
+
+def get_multi_floor_graph(db_path):
+
+    return get_store(db_path).multi_floor_graph()
+
+
+def get_compact_graph(db_path, floor=None):
+
+    return get_store(db_path).compact_graph(floor)
+
+
+def warm_up(db_path=None):
+
+    store = get_store(db_path)
+    if loader.env_variables["routing_engine"] == "csr":
+        for floor in store.graphs():
+            store.compact_graph(floor)
+        store.compact_graph()
+    return store.graphs()
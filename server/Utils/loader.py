@@ -12,6 +12,22 @@ env_variables = {
     "teacher_data": os.getenv("EXCEL_TEACHER_PATH"),
     "image_assets": os.getenv("ASSETS_DIR"),
     "audio_path": os.getenv("AUDIO_DIR"),
+    "routing_algorithm": os.getenv("ROUTING_ALGORITHM", "dijkstra"),
+    "routing_engine": os.getenv("ROUTING_ENGINE", "networkx"),
+    "route_cache_size": int(os.getenv("ROUTE_CACHE_SIZE", "256")),
+    "route_cache_ttl": float(os.getenv("ROUTE_CACHE_TTL", "3600")),
+    "route_cache_check_interval": float(os.getenv("ROUTE_CACHE_CHECK_INTERVAL", "2")),
+    "route_artifact_dir": os.getenv(
+        "ROUTE_ARTIFACT_DIR",
+        os.path.join(os.getenv("OUTPUT_MAPS_DIR") or "Output_Maps", "routes"),
+    ),
+    "route_artifact_limit": int(os.getenv("ROUTE_ARTIFACT_LIMIT", "512")),
+    "sqlite_cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-8000")),
+    "sqlite_mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(64 * 1024 * 1024))),
+    "map_db_immutable": (
+        os.getenv("MAP_DB_IMMUTABLE", "0").lower() in {"1", "true", "yes"}
+    ),
+    "nlp_eager_load": os.getenv("NLP_EAGER_LOAD", "0").lower() in {"1", "true", "yes"},
 }
 
 print(env_variables["python_path"])
@@ -0,0 +1,54 @@
+import os
+import threading
+from .db_connections import map_connection
+
+
+class RefreshingIndex:
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _data_version(self):
+
+        version = []
+        for path in (self.db_path, f"{self.db_path}-wal"):
+            try:
+                version.append(os.path.getmtime(path))
+            except OSError:
+                version.append(None)
+        return tuple(version)
+
+    def build(self, conn):
+
+        raise NotImplementedError
+
+    def load(self):
+
+        version = self._data_version()
+        self.build(map_connection(self.db_path))
+        self._version = version
+
+    def refresh(self):
+
+        if self._version != self._data_version():
+            with self._lock:
+                if self._version != self._data_version():
+                    self.load()
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(index_class, db_path):
+
+    key = (index_class, os.path.abspath(db_path))
+    index = _indexes.get(key)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(key)
+            if index is None:
+                index = _indexes[key] = index_class(key[1])
+    return index
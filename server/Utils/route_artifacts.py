@@ -0,0 +1,112 @@
+import os
+import re
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from . import loader
+
+
+ARTIFACT_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+
+class ArtifactStore:
+
+    def __init__(self, directory, max_items=512, max_memory_items=64):
+        self.directory = directory
+        self.max_items = max_items
+        self.max_memory_items = max_memory_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, artifact_id):
+
+        return os.path.join(self.directory, f"{artifact_id}.svg")
+
+    def _remember(self, artifact_id, svg_bytes):
+
+        with self._lock:
+            self._memory[artifact_id] = svg_bytes
+            self._memory.move_to_end(artifact_id)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+
+    def _prune(self):
+
+        try:
+            entries = [
+                entry
+                for entry in os.scandir(self.directory)
+                if entry.name.endswith(".svg")
+            ]
+        except OSError:
+            return
+
+        if len(entries) <= self.max_items:
+            return
+
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[: len(entries) - self.max_items]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def put(self, svg_bytes: bytes) -> str:
+
+        artifact_id = hashlib.sha256(svg_bytes).hexdigest()[:32]
+        path = self._path(artifact_id)
+
+        if os.path.exists(path):
+            os.utime(path)
+        else:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(svg_bytes)
+                os.replace(temp_path, path)
+            except OSError:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+                raise
+            self._prune()
+
+        self._remember(artifact_id, svg_bytes)
+        return artifact_id
+
+    def touch(self, artifact_id: str, svg_bytes: bytes) -> str:
+
+        try:
+            os.utime(self._path(artifact_id))
+        except OSError:
+            return self.put(svg_bytes)
+        return artifact_id
+
+    def get(self, artifact_id: str):
+
+        if not artifact_id or not ARTIFACT_ID_PATTERN.fullmatch(artifact_id):
+            return None
+
+        with self._lock:
+            svg_bytes = self._memory.get(artifact_id)
+            if svg_bytes is not None:
+                self._memory.move_to_end(artifact_id)
+                return svg_bytes
+
+        try:
+            with open(self._path(artifact_id), "rb") as f:
+                svg_bytes = f.read()
+        except OSError:
+            return None
+
+        self._remember(artifact_id, svg_bytes)
+        return svg_bytes
+
+
+artifact_store = ArtifactStore(
+    loader.env_variables["route_artifact_dir"],
+    max_items=loader.env_variables["route_artifact_limit"],
+)
@@ -0,0 +1,117 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from . import loader
+
+
+def make_key(start: str, end: str, preference: str = None):
+
+    return (
+        start.strip(),
+        end.strip(),
+        preference.strip() if isinstance(preference, str) else preference,
+    )
+
+
+class RouteCache:
+
+    def __init__(self, maxsize=256, ttl=3600, check_interval=2.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self._checked_at = None
+        self._generation = 0
+
+    def _data_version(self):
+
+        paths = [loader.env_variables["db_path"]]
+        floor_map = loader.env_variables["floor_map"]
+        if floor_map and os.path.isdir(floor_map):
+            paths.extend(entry.path for entry in os.scandir(floor_map))
+
+        version = []
+        for path in paths:
+            try:
+                version.append(os.path.getmtime(path))
+            except (OSError, TypeError):
+                version.append(None)
+        return tuple(version)
+
+    def _check_version(self):
+
+        now = time.monotonic()
+        checked_at = self._checked_at
+        if checked_at is not None and now - checked_at < self.check_interval:
+            return
+
+        version = self._data_version()
+        with self._lock:
+            self._checked_at = now
+            if version != self._version:
+                self._entries.clear()
+                self._generation += 1
+                self._version = version
+
+    def generation(self):
+
+        self._check_version()
+        return self._generation
+
+    def get(self, key):
+
+        self._check_version()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value, generation=None):
+
+        self._check_version()
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return True
+
+    def clear(self):
+
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self):
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+route_cache = RouteCache(
+    maxsize=loader.env_variables["route_cache_size"],
+    ttl=loader.env_variables["route_cache_ttl"],
+    check_interval=loader.env_variables["route_cache_check_interval"],
+)
@@ -0,0 +1,238 @@
+import os
+import hashlib
+import sqlite3
+import threading
+import argparse
+from datetime import datetime
+import networkx as nx
+from . import graph_converter, graph_store, loader
+from .db_connections import map_connection
+
+
+def create_route_table(cursor):
+
+    cursor.execute(
+        """
+CREATE TABLE IF NOT EXISTS route_predecessors (
+    source_id INTEGER NOT NULL,
+    node_id INTEGER NOT NULL,
+    predecessor_id INTEGER,
+    distance REAL NOT NULL,
+    PRIMARY KEY (source_id, node_id)
+) WITHOUT ROWID;"""
+    )
+
+    cursor.execute(
+        """
+CREATE TABLE IF NOT EXISTS route_table_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);"""
+    )
+
+
+def graphs_fingerprint(graphs):
+
+    digest = hashlib.sha1()
+    for floor in sorted(graphs):
+        G = graphs[floor]
+        edges = sorted(
+            (min(u, v), max(u, v), round(data["weight"], 6))
+            for u, v, data in G.edges(data=True)
+        )
+        digest.update(repr((floor, sorted(G.nodes), edges)).encode())
+    return digest.hexdigest()
+
+
+def get_described_point_ids(cursor):
+
+    cursor.execute("SELECT DISTINCT anchor_point_id FROM anchor_point_description")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def build_route_table(db_path):
+
+    graphs = graph_converter.create_graphs_from_db(db_path)
+
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.cursor()
+
+        create_route_table(cursor)
+        cursor.execute("DELETE FROM route_predecessors")
+        cursor.execute("DELETE FROM route_table_meta")
+
+        described = get_described_point_ids(cursor)
+        row_count = 0
+
+        for floor, G in sorted(graphs.items()):
+            sources = sorted(described.intersection(G.nodes))
+            for source in sources:
+                distances, paths = nx.single_source_dijkstra(G, source, weight="weight")
+                rows = [
+                    (
+                        source,
+                        node,
+                        paths[node][-2] if len(paths[node]) > 1 else None,
+                        distance,
+                    )
+                    for node, distance in distances.items()
+                ]
+                cursor.executemany(
+                    """
+                    INSERT INTO route_predecessors (source_id, node_id, predecessor_id, distance)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    rows,
+                )
+                row_count += len(rows)
+            print(f"Floor {floor}: {len(sources)} route sources precomputed.")
+
+        cursor.executemany(
+            "INSERT INTO route_table_meta (key, value) VALUES (?, ?)",
+            [
+                ("fingerprint", graphs_fingerprint(graphs)),
+                ("built_at", datetime.now().isoformat()),
+            ],
+        )
+
+    print(f"{row_count} rows written to the route_predecessors table.")
+    return row_count
+
+
+WALK_QUERY = """
+WITH RECURSIVE walk(node_id, predecessor_id) AS (
+    SELECT node_id, predecessor_id FROM route_predecessors
+    WHERE source_id = :source AND node_id = :node
+    UNION ALL
+    SELECT r.node_id, r.predecessor_id
+    FROM route_predecessors r JOIN walk w ON r.node_id = w.predecessor_id
+    WHERE r.source_id = :source
+)
+SELECT node_id FROM walk
+"""
+
+
+class RouteTable:
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._graphs = None
+        self._fresh = False
+
+    def _load(self, graphs):
+
+        fresh = False
+        try:
+            cursor = map_connection(self.db_path).cursor()
+            cursor.execute(
+                "SELECT value FROM route_table_meta WHERE key = 'fingerprint'"
+            )
+            row = cursor.fetchone()
+            if row and row[0] == graphs_fingerprint(graphs):
+                cursor.execute("SELECT 1 FROM route_predecessors LIMIT 1")
+                fresh = cursor.fetchone() is not None
+        except sqlite3.Error:
+            fresh = False
+
+        self._fresh = fresh
+        self._graphs = graphs
+
+    def is_fresh(self):
+
+        graphs = graph_store.get_store(self.db_path).graphs()
+        if graphs is not self._graphs:
+            with self._lock:
+                if graphs is not self._graphs:
+                    self._load(graphs)
+        return self._fresh
+
+    def _distance(self, source, node):
+
+        row = (
+            map_connection(self.db_path)
+            .execute(
+                "SELECT distance FROM route_predecessors "
+                "WHERE source_id = ? AND node_id = ?",
+                (source, node),
+            )
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def _walk(self, source, node):
+
+        rows = map_connection(self.db_path).execute(
+            WALK_QUERY, {"source": source, "node": node}
+        )
+        return [row[0] for row in rows]
+
+    def distance(self, start, end):
+
+        if not self.is_fresh():
+            return None
+
+        try:
+            distance = self._distance(start, end)
+            if distance is None:
+                distance = self._distance(end, start)
+        except sqlite3.Error:
+            return None
+        return distance
+
+    def lookup(self, start, end):
+
+        if not self.is_fresh():
+            return None
+
+        try:
+            distance = self._distance(start, end)
+            if distance is not None:
+                path = self._walk(start, end)
+                path.reverse()
+                return path, distance
+
+            distance = self._distance(end, start)
+            if distance is not None:
+                return self._walk(end, start), distance
+        except sqlite3.Error:
+            pass
+        return None
+
+    def nearest(self, start, targets):
+
+        best_target, best_distance = None, float("inf")
+        for target in targets:
+            distance = self.distance(start, target)
+            if distance is None:
+                return None
+            if distance < best_distance:
+                best_target, best_distance = target, distance
+
+        if best_target is None:
+            return None
+        path, distance = self.lookup(start, best_target)
+        return best_target, path, distance
+
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+def get_route_table(db_path=None):
+
+    key = os.path.abspath(db_path or loader.env_variables["db_path"])
+    with _tables_lock:
+        table = _tables.get(key)
+        if table is None:
+            table = _tables[key] = RouteTable(key)
+    return table
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute the route table")
+    parser.add_argument(
+        "--db", type=str, default=loader.env_variables["db_path"], help="Map DB path"
+    )
+    args = parser.parse_args()
+    build_route_table(args.db)
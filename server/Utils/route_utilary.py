@@ -1,7 +1,14 @@
 from sqlite3 import DatabaseError
-from flask import Flask, jsonify, request, send_file
+from flask import Flask, Response, jsonify, request, send_file
 from .db_access import add_teacher_to_db, get_teacher_data, sqlite3
-from .svg_manipulator import main as make_svg, output as output_svg_location
+from .svg_manipulator import (
+    main as make_svg,
+    output as output_svg_location,
+    floor_svg as floor_svg_location,
+)
+from .route_cache import route_cache, make_key
+from .route_artifacts import artifact_store
+from .db_connections import map_connection
 from .loader import env_variables
 import os
 
@@ -11,37 +18,76 @@ class InvalidInputError(Exception):
     pass
 
 
+def get_route(start, end, preference, mode="full"):
+
+    key = make_key(start, end, preference)
+    generation = route_cache.generation()
+    cached = route_cache.get(key + (mode,))
+    if cached is None:
+        result = make_svg(*key, write_files=False, mode=mode)
+        if result["error"]:
+            return result
+
+        cached = {
+            "path": result["path"],
+            "total_weight": result["total_weight"],
+            "complexity": result["complexity"],
+            "svgs": result["svgs"],
+            "error": None,
+        }
+        if cached["complexity"] == "complex":
+            cached["artifacts"] = {
+                floor: artifact_store.put(svg_bytes)
+                for floor, svg_bytes in cached["svgs"].items()
+            }
+        route_cache.put(key + (mode,), cached, generation)
+    elif cached["complexity"] == "complex":
+        # Artifact files are pruned by age across all workers, so a cached
+        # route re-writes any SVG that has been pruned since it was built.
+        for floor, artifact_id in cached["artifacts"].items():
+            artifact_store.touch(artifact_id, cached["svgs"][floor])
+
+    return cached
+
+
 def process_path_logic(data):
     start = data.get("start")
     end = data.get("end")
     preference = data.get("preference")
+    mode = data.get("mode") or "full"
 
     if not start or not end:
         return {"error": "Start and end points are required"}, 400
     if start == end:
         return {"error": "Start and end points cannot be the same"}, 400
+    if mode not in {"full", "overlay"}:
+        return {"error": "Mode must be 'full' or 'overlay'"}, 400
 
     try:
 
-        result = make_svg(start, end, preference)
+        result = get_route(start, end, preference, mode)
 
         if result["error"]:
             return {"error": result["error"]}, 500
 
         if result["complexity"] == "simple":
             floor_no = result["path"][0]
-            output_svg = output_svg_location(floor_no)
-            return send_file(output_svg, mimetype="image/svg+xml"), 200
+            return (
+                Response(result["svgs"][floor_no], mimetype="image/svg+xml"),
+                200,
+            )
 
         elif result["complexity"] == "complex":
             start_floor = result["path"][0][0]
             end_floor = result["path"][1][0]
+            start_id = result["artifacts"][start_floor]
+            end_id = result["artifacts"][end_floor]
             return (
                 jsonify(
                     {
                         "files": {
-                            "start_floor": f"/load_shortest_path_svg?floor={start_floor}",
-                            "end_floor": f"/load_shortest_path_svg?floor={end_floor}",
+                            "start_floor": f"/load_shortest_path_svg?floor={start_floor}&id={start_id}",
+                            "end_floor": f"/load_shortest_path_svg?floor={end_floor}&id={end_id}",
                         }
                     }
                 ),
@@ -57,17 +103,26 @@ def load_svg_logic(floor):
     if not floor:
         return {"error": "Floor parameter is required"}, 400
 
-    svg_path = os.path.join(env_variables["floor_map"], f"Floor {floor} copy path.svg")
+    svg_path = floor_svg_location(floor)
     if not os.path.exists(svg_path):
         return {"error": f"SVG file for floor {floor} not found"}, 404
 
-    return send_file(svg_path, mimetype="image/svg+xml"), 200
+    return send_file(svg_path, mimetype="image/svg+xml", max_age=3600), 200
 
 
-def load_shortest_path_svg_logic(floor):
+def load_shortest_path_svg_logic(floor, artifact_id=None):
     if not floor:
         return {"error": "Floor parameter is required"}, 400
 
+    if artifact_id:
+        svg_bytes = artifact_store.get(artifact_id)
+        if svg_bytes is None:
+            return {"error": f"Route SVG '{artifact_id}' not found or expired"}, 404
+        response = Response(svg_bytes, mimetype="image/svg+xml")
+        response.cache_control.public = True
+        response.cache_control.max_age = 3600
+        return response, 200
+
     svg_path = output_svg_location(floor)
     if not os.path.exists(svg_path):
         return {"error": f"SVG file for floor {floor} not found"}, 404
@@ -119,7 +174,7 @@ def get_room_no_by_cabin(cabin_no, db_path):
 
     try:
 
-        with sqlite3.connect(db_path) as conn:
+        with map_connection(db_path) as conn:
             cursor = conn.cursor()
 
             query = """
@@ -0,0 +1,131 @@
+import heapq
+import re
+import marisa_trie
+from . import loader
+from .refreshing_index import RefreshingIndex, get_index
+
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+KIND_PRIORITY = {"location": 0, "room": 1, "teacher": 2}
+
+
+def normalize(text) -> str:
+
+    return " ".join(TOKEN_PATTERN.findall(str(text or "").lower()))
+
+
+def suffix_keys(text: str):
+
+    tokens = text.split(" ")
+    return {" ".join(tokens[i:]) for i in range(len(tokens))}
+
+
+class SuggestIndex(RefreshingIndex):
+
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self.entries = (marisa_trie.Trie(), {}, [])
+
+    def _fetch_suggestions(self, conn):
+
+        locations = conn.execute(
+            """
+            SELECT TRIM(apd.description), TRIM(apd.extra_info), apc.floor
+            FROM anchor_point_description apd
+            JOIN anchor_point_coordinates apc ON apc.id = apd.anchor_point_id
+            """
+        ).fetchall()
+        teachers = conn.execute(
+            "SELECT name, cabin_no, room_no FROM teachers"
+        ).fetchall()
+
+        suggestions = {}
+
+        def add(kind, label, value, floor=None, detail=None):
+
+            if not label or not value:
+                return
+            suggestion = suggestions.setdefault(
+                (kind, label, value),
+                {
+                    "type": kind,
+                    "label": label,
+                    "value": value,
+                    "floors": set(),
+                    "detail": detail,
+                },
+            )
+            if floor is not None:
+                suggestion["floors"].add(floor)
+
+        for description, extra_info, floor in locations:
+            add("location", description, description, floor)
+            add("room", extra_info, extra_info, floor, description or None)
+
+        for name, cabin_no, room_no in teachers:
+            label = name.strip().title()
+            add("teacher", label, room_no, detail=cabin_no)
+            if cabin_no:
+                add("teacher", cabin_no.strip(), room_no, detail=label)
+
+        return list(suggestions.values())
+
+    def build(self, conn):
+
+        suggestions = self._fetch_suggestions(conn)
+
+        keys = {}
+        for position, suggestion in enumerate(suggestions):
+            suggestion["floors"] = sorted(suggestion["floors"])
+            suggestion["normalized"] = normalize(suggestion["label"])
+            for key in suffix_keys(suggestion["normalized"]):
+                keys.setdefault(key, []).append(position)
+
+        self.entries = (marisa_trie.Trie(keys), keys, suggestions)
+        print(f"Suggest index loaded: {len(suggestions)} entries, {len(keys)} keys")
+
+    def suggest(self, query: str, limit: int = 10):
+
+        self.refresh()
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        trie, keys, suggestions = self.entries
+        positions = {
+            position for key in trie.iterkeys(prefix) for position in keys[key]
+        }
+
+        def rank(position):
+
+            normalized = suggestions[position]["normalized"]
+            return (
+                normalized != prefix,
+                not normalized.startswith(prefix),
+                KIND_PRIORITY[suggestions[position]["type"]],
+                len(normalized),
+                normalized,
+            )
+
+        return [
+            {
+                field: suggestions[position][field]
+                for field in ("type", "label", "value", "floors", "detail")
+            }
+            for position in heapq.nsmallest(limit, positions, key=rank)
+        ]
+
+
+def get_suggest_index(db_path=loader.env_variables["db_path"]):
+
+    return get_index(SuggestIndex, db_path)
+
+
+def suggest(query, limit=10, db_path=loader.env_variables["db_path"]):
+
+    return get_suggest_index(db_path).suggest(query, limit)
+
+
+def warm_up(db_path=loader.env_variables["db_path"]):
+
+    get_suggest_index(db_path).refresh()
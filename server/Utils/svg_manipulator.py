@@ -2,16 +2,20 @@ from . import db_shortest_path_maker
 from lxml import etree as ET
 from . import loader
 import os
+import re
+import copy
+import threading
 import argparse
 import json
+from math import sqrt
 
 
-def modify_svg(svg_file, output_file, path_points):
+_templates = {}
+_templates_lock = threading.Lock()
 
-    break_polyline_to_lines(svg_file, output_file)
 
-    tree = ET.parse(output_file)
-    root = tree.getroot()
+def apply_path(root, path_points):
+
     NS = {"svg": "http://www.w3.org/2000/svg"}
 
     create_arrow_with_image(
@@ -21,18 +25,94 @@ def modify_svg(svg_file, output_file, path_points):
         image_href=loader.env_variables["image_assets"],
     )
 
+    path_edges = build_path_edges(path_points)
+
     for line in root.xpath("//svg:g[@id='Path']/svg:line", namespaces=NS):
         if "class" in line.attrib:
             del line.attrib["class"]
-        modify_line(line, path_points)
+        modify_line(line, path_points, path_edges)
 
     g_element = root.find(".//svg:g[@id='Path']", namespaces=NS)
 
     if g_element is not None and "class" in g_element.attrib:
         del g_element.attrib["class"]
 
+
+def load_template(svg_file):
+
+    mtime = os.path.getmtime(svg_file)
+    with _templates_lock:
+        entry = _templates.get(svg_file)
+        if entry is None or entry[0] != mtime:
+            entry = (mtime, break_polyline_to_lines(svg_file))
+            _templates[svg_file] = entry
+    return entry[1]
+
+
+def warm_up_templates(floor_map_dir=None):
+
+    floor_map_dir = floor_map_dir or loader.env_variables["floor_map"]
+    loaded = []
+    for name in sorted(os.listdir(floor_map_dir)):
+        match = re.fullmatch(r"floor (\d+) copy path\.svg", name)
+        if match:
+            load_template(floor_svg(int(match.group(1))))
+            loaded.append(int(match.group(1)))
+    return loaded
+
+
+def render_svg(svg_file, path_points) -> bytes:
+
+    tree = copy.deepcopy(load_template(svg_file))
+    apply_path(tree.getroot(), path_points)
+
+    return ET.tostring(tree, pretty_print=True, xml_declaration=True, encoding="UTF-8")
+
+
+def render_overlay(svg_file, path_points) -> bytes:
+
+    template = load_template(svg_file).getroot()
+    svg_ns = "http://www.w3.org/2000/svg"
+    xlink_ns = "http://www.w3.org/1999/xlink"
+
+    root = ET.Element(
+        f"{{{svg_ns}}}svg",
+        {
+            key: value
+            for key, value in template.attrib.items()
+            if key in {"viewBox", "width", "height", "version"}
+        },
+        nsmap={None: svg_ns, "xlink": xlink_ns},
+    )
+    root.set("id", "RouteOverlay")
+
+    route = ET.SubElement(root, f"{{{svg_ns}}}g", {"id": "Route"})
+    ET.SubElement(
+        route,
+        f"{{{svg_ns}}}polyline",
+        {
+            "points": " ".join(f"{x},{y}" for x, y in path_points),
+            "fill": "none",
+            "stroke": "red",
+            "stroke-width": "1",
+            "stroke-linejoin": "round",
+        },
+    )
+
+    create_arrow_with_image(
+        root,
+        path_points[-2],
+        path_points[-1],
+        image_href=loader.env_variables["image_assets"],
+    )
+
+    return ET.tostring(root, pretty_print=True, xml_declaration=True, encoding="UTF-8")
+
+
+def modify_svg(svg_file, output_file, path_points):
+
     with open(output_file, "wb") as f:
-        tree.write(f, pretty_print=True, xml_declaration=True, encoding="utf-8")
+        f.write(render_svg(svg_file, path_points))
 
     return output_file
 
@@ -58,7 +138,7 @@ def parse_svg_text(svg_file):
     return text_data
 
 
-def break_polyline_to_lines(svg_file, output_file):
+def break_polyline_to_lines(svg_file, output_file=None):
 
     parser = ET.XMLParser(remove_blank_text=True)
     tree = ET.parse(svg_file, parser)
@@ -80,7 +160,11 @@ def break_polyline_to_lines(svg_file, output_file):
                 x1, y1 = point_pairs[i]
                 x2, y2 = point_pairs[i + 1]
                 line = ET.Element(
-                    "line",
+                    (
+                        ET.QName(polyline.tag.rsplit("}", 1)[0][1:], "line")
+                        if polyline.tag.startswith("{")
+                        else "line"
+                    ),
                     {
                         "x1": str(x1),
                         "y1": str(y1),
@@ -94,7 +178,11 @@ def break_polyline_to_lines(svg_file, output_file):
 
             parent.remove(polyline)
 
-    tree.write(output_file, pretty_print=True, xml_declaration=True, encoding="utf-8")
+    if output_file:
+        tree.write(
+            output_file, pretty_print=True, xml_declaration=True, encoding="utf-8"
+        )
+    return tree
 
 
 def create_arrow_with_image(
@@ -183,15 +271,45 @@ def create_arrow_with_image(
     svg_root.append(arrow_line)
 
 
-def modify_line(line, path_points):
+def quantize_point(point, precision=3):
 
-    def is_point_in_path(point, path_points, tolerance=1e-6):
+    return (round(float(point[0]), precision), round(float(point[1]), precision))
+
+
+def is_straight_run(a, b, c, tolerance=1e-3):
+
+    ab = (b[0] - a[0], b[1] - a[1])
+    bc = (c[0] - b[0], c[1] - b[1])
+    cross = ab[0] * bc[1] - ab[1] * bc[0]
+    dot = ab[0] * bc[0] + ab[1] * bc[1]
+    return dot > 0 and abs(cross) <= tolerance * sqrt(
+        (ab[0] ** 2 + ab[1] ** 2) * (bc[0] ** 2 + bc[1] ** 2)
+    )
+
+
+def build_path_edges(path_points):
+
+    keys = [quantize_point(point) for point in path_points]
+    edges = {frozenset(edge) for edge in zip(keys, keys[1:])}
+
+    # A drawn line can span several graph edges when the map import split it
+    # at a junction, so every pair of vertices on a straight run of the path
+    # also counts as an edge.
+    start = 0
+    for end in range(2, len(keys) + 1):
+        if end == len(keys) or not is_straight_run(*keys[end - 2 : end + 1]):
+            run = keys[start:end]
+            for i in range(len(run)):
+                for j in range(i + 2, len(run)):
+                    edges.add(frozenset((run[i], run[j])))
+            start = end - 1
+    return edges
 
-        x, y = point
-        return any(
-            abs(float(x) - px) < tolerance and abs(float(y) - py) < tolerance
-            for px, py in path_points
-        )
+
+def modify_line(line, path_points, path_edges=None):
+
+    if path_edges is None:
+        path_edges = build_path_edges(path_points)
 
     try:
         x1, y1 = float(line.get("x1")), float(line.get("y1"))
@@ -201,18 +319,15 @@ def modify_line(line, path_points):
             "Invalid line coordinates: 'x1', 'y1', 'x2', and 'y2' must be valid numbers."
         ) from e
 
-    start_point = (x1, y1)
-    end_point = (x2, y2)
+    start_point = quantize_point((x1, y1))
+    end_point = quantize_point((x2, y2))
 
-    start_in_path = is_point_in_path(start_point, path_points)
-    end_in_path = is_point_in_path(end_point, path_points)
-
-    if start_in_path and end_in_path:
+    if frozenset((start_point, end_point)) in path_edges:
 
         line.set("visibility", "visible")
         line.set("stroke", "red")
 
-        if is_point_in_path(end_point, [path_points[-1]]):
+        if end_point == quantize_point(path_points[-1]):
 
             line.set("marker-end", "url(#arrowhead)")
     else:
@@ -230,7 +345,13 @@ def floor_svg(val: int):
     return os.path.join(loader.env_variables["floor_map"], f"floor {val} copy path.svg")
 
 
-def main(start: str, end: str, preference: str = None):
+def main(
+    start: str,
+    end: str,
+    preference: str = None,
+    write_files: bool = True,
+    mode: str = "full",
+):
 
     db_path = loader.env_variables["db_path"]
 
@@ -241,31 +362,36 @@ def main(start: str, end: str, preference: str = None):
         preference=preference,
     )
 
-    svg_updates = []
+    segments = []
 
     if shortest_path["complexity"] == "complex":
-        msb_start = shortest_path["path"][0][0]
-        msb_end = shortest_path["path"][1][0]
-
-        svg_start = modify_svg(
-            floor_svg(msb_start), output(msb_start), shortest_path["path"][0][1]
-        )
-        svg_end = modify_svg(
-            floor_svg(msb_end), output(msb_end), shortest_path["path"][1][1]
-        )
-        svg_updates.extend([svg_start, svg_end])
+        segments = [
+            (shortest_path["path"][0][0], shortest_path["path"][0][1]),
+            (shortest_path["path"][1][0], shortest_path["path"][1][1]),
+        ]
     elif shortest_path["complexity"] == "simple":
+        segments = [(shortest_path["path"][0], shortest_path["path"][1])]
+
+    svg_updates = []
+    svgs = {}
+
+    render = render_overlay if mode == "overlay" else render_svg
+
+    for floor, path_points in segments:
+        svg_bytes = render(floor_svg(floor), path_points)
+        if write_files:
+            with open(output(floor), "wb") as f:
+                f.write(svg_bytes)
+            svg_updates.append(output(floor))
+        else:
+            svgs[floor] = svg_bytes
 
-        msb_start = shortest_path["path"][0]
-        svg_start = modify_svg(
-            floor_svg(msb_start), output(msb_start), shortest_path["path"][1]
-        )
-        svg_updates.append(svg_start)
     return {
         "path": shortest_path["path"],
         "total_weight": shortest_path["total_weight"],
         "complexity": shortest_path["complexity"],
         "svg_updates": svg_updates,
+        "svgs": svgs,
         "error": shortest_path["error"],
     }
 
@@ -277,5 +403,14 @@ if __name__ == "__main__":
     parser.add_argument(
         "--preference", type=str, default="Lift", help="User preference (optional)"
     )
+    parser.add_argument(
+        "--mode",
+        type=str,
+        default="full",
+        choices=["full", "overlay"],
+        help="Render the full floor or only the route overlay",
+    )
     args = parser.parse_args()
-    print(json.dumps(main(args.start, args.end, args.preference)))
+    result = main(args.start, args.end, args.preference, mode=args.mode)
+    result.pop("svgs")
+    print(json.dumps(result))
@@ -0,0 +1,55 @@
+import os
+import threading
+import traceback
+from time import perf_counter
+from datetime import datetime
+
+
+warm_up_state = {
+    "status": "warming_up",
+    "ready": False,
+    "started_at": None,
+    "finished_at": None,
+    "steps": {},
+    "errors": {},
+}
+_warm_up_lock = threading.Lock()
+
+
+def run_warm_up(steps, optional=()):
+
+    with _warm_up_lock:
+        warm_up_state["status"] = "warming_up"
+        warm_up_state["ready"] = False
+        warm_up_state["started_at"] = datetime.now().isoformat()
+        warm_up_state["finished_at"] = None
+        warm_up_state["steps"] = {}
+        warm_up_state["errors"] = {}
+
+        for name, step in steps.items():
+            start = perf_counter()
+            try:
+                step()
+            except Exception as e:
+                warm_up_state["errors"][name] = str(e)
+                traceback.print_exc()
+            warm_up_state["steps"][name] = round(perf_counter() - start, 4)
+
+        failed = set(warm_up_state["errors"])
+        if failed - set(optional):
+            warm_up_state["status"] = "failed"
+        elif failed:
+            warm_up_state["status"] = "degraded"
+        else:
+            warm_up_state["status"] = "ok"
+
+        warm_up_state["finished_at"] = datetime.now().isoformat()
+        warm_up_state["ready"] = warm_up_state["status"] != "failed"
+        print(f"Warm-up {warm_up_state['status']}: {warm_up_state['steps']}")
+
+    return warm_up_state
+
+
+def health_status():
+
+    return {"pid": os.getpid(), **warm_up_state}
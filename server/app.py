@@ -3,6 +3,12 @@ from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
 from werkzeug.security import check_password_hash, generate_password_hash
 from .Utils.loader import env_variables
+from .Utils.graph_store import warm_up as warm_up_graphs
+from .Utils.route_cache import route_cache
+from .Utils.route_table_maker import get_route_table
+from .Utils.svg_manipulator import warm_up_templates
+from .Utils.suggest_index import suggest, warm_up as warm_up_suggest_index
+from .Utils.warm_up import run_warm_up, health_status
 from .Utils.db_access import (
     get_password_users as get_user_credentials,
 )
@@ -26,13 +32,40 @@ from .Utils.route_utilary import (
 from .Chatbot.audio_to_text import (
     get_teacher_details_with_preprocessing,
     main as process_audio,
+    warm_up_nlp,
 )
+from .Chatbot.teacher_index import warm_up as warm_up_teacher_index
 
 
 app = Flask(__name__)
 CORS(app)
 
 
+def warm_up():
+    steps = {}
+    if env_variables["db_path"]:
+        steps["graphs"] = lambda: warm_up_graphs(env_variables["db_path"])
+        steps["route_table"] = lambda: get_route_table(
+            env_variables["db_path"]
+        ).is_fresh()
+        steps["suggest_index"] = lambda: warm_up_suggest_index(env_variables["db_path"])
+        steps["teacher_index"] = lambda: warm_up_teacher_index(env_variables["db_path"])
+    if env_variables["floor_map"]:
+        steps["floor_templates"] = lambda: warm_up_templates(env_variables["floor_map"])
+    if env_variables["nlp_eager_load"]:
+        steps["nlp"] = warm_up_nlp
+    return run_warm_up(steps, optional={"nlp"})
+
+
+warm_up()
+
+
+@app.route("/health", methods=["GET"])
+def health():
+    status = health_status()
+    return jsonify(status), 200 if status["ready"] else 503
+
+
 @app.route("/load_svg", methods=["GET"])
 def load_svg():
     floor = request.args.get("floor")
@@ -42,7 +75,8 @@ def load_svg():
 @app.route("/load_shortest_path_svg", methods=["GET"])
 def load_shortest_path_svg():
     floor = request.args.get("floor")
-    return load_shortest_path_svg_logic(floor)
+    artifact_id = request.args.get("id")
+    return load_shortest_path_svg_logic(floor, artifact_id)
 
 
 @app.route("/process_path", methods=["POST"])
@@ -52,6 +86,21 @@ def process_path():
     return response, status_code
 
 
+@app.route("/suggest", methods=["GET"])
+def suggest_route():
+    query = request.args.get("q", "")
+    try:
+        limit = min(max(int(request.args.get("limit", 10)), 1), 50)
+    except ValueError:
+        return jsonify({"error": "limit must be an integer."}), 400
+    return jsonify({"query": query, "suggestions": suggest(query, limit)}), 200
+
+
+@app.route("/route_cache_stats", methods=["GET"])
+def route_cache_stats():
+    return jsonify(route_cache.stats()), 200
+
+
 @app.route("/custom_process", methods=["POST"])
 def custom_process():
     try:
@@ -8,13 +8,20 @@ def setup_project():
     try:
         subprocess.run(["pip", "install", "-r", "requirements.txt"], check=True)
         print("Requirements installed successfully.")
+        bundle_nlp_resources()
         setup_env_file()
         ensure_db_files_exist()
+        migrate_map_database()
     except subprocess.CalledProcessError as e:
         print(f"An error occurred during setup: {e}")
         sys.exit(1)
 
 
+def bundle_nlp_resources():
+    subprocess.run([sys.executable, "-m", "server.Chatbot.nlp_resources"], check=True)
+    print("NLTK resources bundled into server/Chatbot/nltk_data.")
+
+
 def setup_env_file():
     if os.getenv("RAILWAY_ENVIRONMENT"):  # Running on Railway
         print("Running on Railway. Skipping .env file creation.")
@@ -67,5 +74,18 @@ def ensure_db_files_exist():
             open(db_file, "w").close()
 
 
+def migrate_map_database():
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "server.Utils.db_migrations",
+            "--db",
+            os.path.join("server", "DB", "Test_Use_3.db"),
+        ],
+        check=True,
+    )
+
+
 if __name__ == "__main__":
     setup_project()